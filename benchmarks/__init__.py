@@ -0,0 +1 @@
+"""Mock Aptner API server and performance benchmarks (development only)."""
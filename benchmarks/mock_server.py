@@ -0,0 +1,250 @@
+"""Local stand-in for the Aptner v2 API.
+
+Serves /auth/token, /fee/detail, /pc/monthly-access-history, paginated
+/pc/reserves and /pc/reserve/ from a synthetic dataset, with injectable
+latency, errors and token expiry.
+
+Run standalone:
+    python -m benchmarks.mock_server --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from aiohttp import web
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+@dataclass
+class MockDataset:
+    """Synthetic Aptner data."""
+
+    fee: dict[str, Any]
+    monthly_access: dict[str, Any]
+    reserves: list[dict[str, Any]]
+    cars: list[str]
+
+def car_number(index: int) -> str:
+    """Return a Korean-style plate number for a car index."""
+    hangul = "가나다라마바사아자차카타파하"
+    return f"{10 + index // 10000 % 90}{hangul[index % len(hangul)]}{index % 10000:04d}"
+
+def generate_dataset(
+    *,
+    reports: int = 10_000,
+    reserve_pages: int = 50,
+    page_size: int = 10,
+    cars: int = 200,
+    months: int = 3,
+    seed: int = 1,
+) -> MockDataset:
+    """Generate access reports and reservations for `cars` cars.
+
+    Reports are newest first within each month, and reservations are
+    ordered by visit date descending, matching the real API.
+    """
+    rng = random.Random(seed)
+    plates = [car_number(i) for i in range(cars)]
+    now = datetime.now().replace(microsecond=0)
+
+    per_month = max(1, reports // months)
+    monthly_list = []
+    for month in range(months):
+        month_end = now - timedelta(days=30 * month)
+        items = []
+        for _ in range(per_month):
+            in_time = month_end - timedelta(seconds=rng.randint(0, 30 * 86400))
+            exited = rng.random() < 0.85 or month > 0
+            out_time = in_time + timedelta(minutes=rng.randint(5, 600))
+            items.append(
+                {
+                    "carNo": rng.choice(plates),
+                    "inDatetime": in_time.strftime(DATETIME_FORMAT),
+                    "outDatetime": out_time.strftime(DATETIME_FORMAT) if exited else None,
+                    "isExit": exited,
+                }
+            )
+        items.sort(key=lambda r: r["inDatetime"], reverse=True)
+        monthly_list.append(
+            {
+                "yearMonth": month_end.strftime("%Y.%m"),
+                "visitCarUseHistoryReportList": items,
+            }
+        )
+
+    today = date.today()
+    reserves = []
+    total = reserve_pages * page_size
+    for i in range(total):
+        # 앞쪽 절반은 미래, 뒤쪽은 과거 예약
+        visit = today + timedelta(days=total // 2 - i)
+        reserves.append(
+            {
+                "carNo": rng.choice(plates),
+                "visitDate": visit.strftime("%Y.%m.%d"),
+                "purpose": "지인/가족방문",
+                "days": 1,
+            }
+        )
+
+    fee = {
+        "fee": {
+            "year": today.year,
+            "month": today.month,
+            "currentFee": 254_320,
+            "details": [
+                {"name": "일반관리비", "value": 80_000},
+                {"name": "전기료", "value": 64_320},
+                {"name": "수도료", "value": 30_000},
+                {"name": "난방비", "value": 80_000},
+            ],
+        }
+    }
+    return MockDataset(
+        fee=fee,
+        monthly_access={"monthlyParkingHistoryList": monthly_list},
+        reserves=reserves,
+        cars=plates,
+    )
+
+def make_token(ttl: float) -> str:
+    """Return an unsigned JWT whose exp is ttl seconds from now."""
+
+    def segment(data: dict[str, Any]) -> str:
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    exp = int(time.time() + ttl)
+    return f"{segment({'alg': 'none'})}.{segment({'exp': exp})}.sig"
+
+@dataclass
+class MockAptnerServer:
+    """aiohttp application emulating the Aptner v2 API."""
+
+    dataset: MockDataset
+    page_size: int = 10
+    # Injectable behaviour
+    latency: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    token_ttl: float = 3600.0
+    seed: int = 1
+    requests: Counter = field(default_factory=Counter)
+    _tokens: dict[str, float] = field(default_factory=dict)
+    _runner: web.AppRunner | None = None
+    base_url: str = ""
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def expire_tokens(self) -> None:
+        """Invalidate every issued token (next request gets a 401)."""
+        self._tokens.clear()
+
+    def reset_counters(self) -> None:
+        """Zero the per-path request counters."""
+        self.requests.clear()
+
+    @property
+    def round_trips(self) -> int:
+        """Return the total number of requests served."""
+        return sum(self.requests.values())
+
+    def make_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/auth/token", self._auth_token)
+        app.router.add_get("/fee/detail", self._fee)
+        app.router.add_get("/pc/monthly-access-history", self._access_history)
+        app.router.add_get("/pc/reserves", self._reserves)
+        app.router.add_post("/pc/reserve/", self._reserve)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.base_url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests[request.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return web.json_response({"message": "injected error"}, status=self.error_status)
+        if request.path != "/auth/token":
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            expires = self._tokens.get(token)
+            if expires is None or expires <= time.time():
+                return web.json_response({"message": "unauthorized"}, status=401)
+        return await handler(request)
+
+    async def _auth_token(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if not body.get("id") or not body.get("password"):
+            return web.json_response({"message": "bad credentials"}, status=400)
+        token = make_token(self.token_ttl)
+        self._tokens[token] = time.time() + self.token_ttl
+        return web.json_response({"accessToken": token})
+
+    async def _fee(self, request: web.Request) -> web.Response:
+        return web.json_response(self.dataset.fee)
+
+    async def _access_history(self, request: web.Request) -> web.Response:
+        return web.json_response(self.dataset.monthly_access)
+
+    async def _reserves(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("pg", "1"))
+        rows = self.dataset.reserves
+        total_pages = max(1, -(-len(rows) // self.page_size))
+        start = (page - 1) * self.page_size
+        return web.json_response(
+            {
+                "totalPages": total_pages,
+                "reserveList": rows[start : start + self.page_size],
+            }
+        )
+
+    async def _reserve(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.dataset.reserves.insert(0, body)
+        self.dataset.reserves.sort(key=lambda r: r["visitDate"], reverse=True)
+        return web.json_response({})
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--reserve-pages", type=int, default=50)
+    parser.add_argument("--cars", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    dataset = generate_dataset(
+        reports=args.reports, reserve_pages=args.reserve_pages, cars=args.cars
+    )
+    server = MockAptnerServer(dataset, latency=args.latency, error_rate=args.error_rate)
+    web.run_app(server.make_app(), port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""End-to-end performance benchmarks for AptnerClient against the mock server.
+
+For each client method (and one full coordinator refresh cycle) reports
+round trips, wall time, peak Python memory and JSON parse time.
+
+    python -m benchmarks.run --reports 10000 --reserve-pages 50 --cars 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.aptner.api import AptnerClient
+
+from .mock_server import MockAptnerServer, generate_dataset
+
+@dataclass
+class BenchResult:
+    name: str
+    round_trips: int
+    wall_ms: float
+    peak_kib: float
+    parse_ms: float
+
+async def measure(
+    name: str,
+    server: MockAptnerServer,
+    new_client: Callable[[], Awaitable[AptnerClient]],
+    func: Callable[[AptnerClient], Awaitable[Any]],
+    repeat: int,
+) -> BenchResult:
+    """Run func `repeat` times, each on a fresh client, and average the cost.
+
+    A fresh client starts with no response cache, event index, fee cache
+    or request history, so every repeat measures the cold path. Peak memory
+    comes from one extra run under tracemalloc, which isn't timed (tracing
+    slows allocation-heavy code several times over).
+    """
+    round_trips = 0
+    wall = 0.0
+    parse = 0.0
+    peak = 0
+    for traced in [True] + [False] * repeat:
+        client = await new_client()
+        try:
+            server.reset_counters()
+            if traced:
+                tracemalloc.start()
+                await func(client)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                continue
+            start = time.perf_counter()
+            await func(client)
+            wall += time.perf_counter() - start
+            parse += client.metrics.total("parse_time_total")
+            round_trips += server.round_trips
+        finally:
+            await client.async_close()
+    return BenchResult(
+        name=name,
+        round_trips=round(round_trips / repeat),
+        wall_ms=round(wall / repeat * 1000, 2),
+        peak_kib=round(peak / 1024, 1),
+        parse_ms=round(parse / repeat * 1000, 2),
+    )
+
+async def run(args: argparse.Namespace) -> list[BenchResult]:
+    dataset = generate_dataset(
+        reports=args.reports,
+        reserve_pages=args.reserve_pages,
+        cars=args.cars,
+    )
+    server = MockAptnerServer(dataset, latency=args.latency)
+    base_url = await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            cars = dataset.cars[:10]
+
+            async def new_client() -> AptnerClient:
+                # 인증은 측정에서 제외
+                client = AptnerClient(hass, "bench", "bench", base_url=base_url)
+                await client.authenticate()
+                return client
+
+            async def refresh_cycle(client: AptnerClient) -> None:
+                # 코디네이터 한 번의 갱신과 동일한 요청 묶음
+                await asyncio.gather(
+                    client.get_fee(),
+                    client.get_reserve_status(),
+                    client.get_car_status(),
+                )
+
+            benches: list[tuple[str, Callable[[AptnerClient], Awaitable[Any]]]] = [
+                ("get_fee", lambda client: client.get_fee()),
+                ("find_car", lambda client: client.find_car()),
+                ("find_car(carno)", lambda client: client.find_car(cars[0])),
+                ("get_car_status", lambda client: client.get_car_status()),
+                ("get_reserve_status", lambda client: client.get_reserve_status()),
+                ("refresh_cycle", refresh_cycle),
+            ]
+            return [
+                await measure(name, server, new_client, func, args.repeat)
+                for name, func in benches
+            ]
+        finally:
+            await hass.async_stop(force=True)
+            await server.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--reserve-pages", type=int, default=50)
+    parser.add_argument("--cars", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency (s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return
+    print(f"{'benchmark':<22}{'round trips':>12}{'wall ms':>12}{'peak KiB':>12}{'parse ms':>12}")
+    for r in results:
+        print(f"{r.name:<22}{r.round_trips:>12}{r.wall_ms:>12}{r.peak_kib:>12}{r.parse_ms:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import logging
-import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .api import AptnerClient
+from .api import async_acquire_client, async_release_client, async_remove_account_data
+from .coordinator import AptnerDataCoordinator, snapshot_store
+from .reserve_sync import AptnerReserveSync
+from .services import async_setup_services
 from .const import (
     DOMAIN,
     PLATFORMS,
@@ -20,125 +22,48 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
-SERVICE_FEE = "fee"
-SERVICE_FINDCAR = "findcar"
-SERVICE_GET_CAR_STATUS = "get_car_status"  # 새로운 서비스
-SERVICE_GET_RESERVE_STATUS = "get_reserve_status"
-SERVICE_RESERVE_CAR = "reserve_car"
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     hass.data.setdefault(DOMAIN, {})
+    # 서비스는 도메인 단위로 한 번만 등록 (엔트리별 라우팅은 entry_id)
+    async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Aptner from a config entry."""
     _LOGGER.debug("Setting up Aptner entry: %s", entry.entry_id)
     
-    client = AptnerClient(
-        hass,
-        user_id=entry.data[CONF_ID],
-        password=entry.data[CONF_PASSWORD],
-    )
-    
-    # Store client
-    hass.data[DOMAIN][entry.entry_id] = {
-        "client": client,
-    }
-
-    # Register services (mirror pyscript services)
-    async def svc_fee(call: ServiceCall):
-        try:
-            return await client.get_fee()
-        except Exception as e:
-            raise HomeAssistantError(f"Aptner fee failed: {e}") from e
-
-    async def svc_findcar(call: ServiceCall):
-        try:
-            carno = call.data.get("carno")
-            return await client.find_car(carno=carno)
-        except Exception as e:
-            raise HomeAssistantError(f"Aptner findcar failed: {e}") from e
-
-    async def svc_get_car_status(call: ServiceCall):
-        """Get current car status for device tracking."""
-        try:
-            entry_id = call.data.get("entry_id")
-            client_to_use = client  # 기본적으로 현재 엔트리의 클라이언트 사용
-            
-            if entry_id and entry_id in hass.data[DOMAIN]:
-                client_to_use = hass.data[DOMAIN][entry_id]["client"]
-            
-            carno = call.data.get("carno")
-            return await client_to_use.get_car_status(carno=carno)
-        except Exception as e:
-            raise HomeAssistantError(f"Aptner get_car_status failed: {e}") from e
-
-    async def svc_get_reserve_status(call: ServiceCall):
-        try:
-            return await client.get_reserve_status()
-        except Exception as e:
-            raise HomeAssistantError(f"Aptner get_reserve_status failed: {e}") from e
-
-    async def svc_reserve_car(call: ServiceCall):
-        try:
-            await client.reserve_car(
-                date=call.data["date"],
-                purpose=call.data["purpose"],
-                carno=call.data["carno"],
-                days=int(call.data["days"]),
-                phone=call.data["phone"],
-            )
-        except Exception as e:
-            raise HomeAssistantError(f"Aptner reserve_car failed: {e}") from e
-
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_FEE,
-        svc_fee,
-        schema=vol.Schema({}),
-        supports_response=True,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_FINDCAR,
-        svc_findcar,
-        schema=vol.Schema({vol.Optional("carno"): str}),
-        supports_response=True,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_GET_CAR_STATUS,
-        svc_get_car_status,
-        schema=vol.Schema({
-            vol.Optional("entry_id"): str,
-            vol.Optional("carno"): str,
-        }),
-        supports_response=True,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_GET_RESERVE_STATUS,
-        svc_get_reserve_status,
-        schema=vol.Schema({}),
-        supports_response=True,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_RESERVE_CAR,
-        svc_reserve_car,
-        schema=vol.Schema(
-            {
-                vol.Required("date"): str,     # yyyy.MM.dd
-                vol.Required("purpose"): str,
-                vol.Required("carno"): str,
-                vol.Required("days"): vol.Coerce(int),
-                vol.Required("phone"): str,
-            }
-        ),
+    # 같은 계정의 엔트리는 하나의 클라이언트(토큰/캐시)를 공유
+    client = await async_acquire_client(
+        hass, entry.data[CONF_ID], entry.data[CONF_PASSWORD]
     )
 
-    # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    try:
+        reserve_sync = AptnerReserveSync(hass, client, entry.entry_id)
+        await reserve_sync.async_load()
+
+        coordinator = AptnerDataCoordinator(hass, entry, client, reserve_sync)
+        # 저장된 스냅샷으로 즉시 복원 (네트워크 갱신은 플랫폼 설정 후 백그라운드에서)
+        await coordinator.async_restore()
+
+        # Store client
+        hass.data[DOMAIN][entry.entry_id] = {
+            "client": client,
+            "reserve_sync": reserve_sync,
+            "coordinator": coordinator,
+        }
+
+        # Set up platforms
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except BaseException:
+        # 설정이 실패하면 공유 클라이언트 참조를 돌려줌
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await async_release_client(hass, entry.data[CONF_ID])
+        raise
+
+    coordinator.async_start_background_refresh()
+    entry.async_on_unload(coordinator.async_shutdown)
     
     # Add update listener for options changes
     entry.async_on_unload(
@@ -159,4 +84,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok and DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
         hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+        await async_release_client(hass, entry.data[CONF_ID])
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a deleted config entry."""
+    await AptnerReserveSync(hass, None, entry.entry_id).async_remove()
+    await snapshot_store(hass, entry.entry_id, "data").async_remove()
+    await snapshot_store(hass, entry.entry_id, "analytics").async_remove()
+    # 계정 단위 저장소(토큰, 관리비 캐시, 주차 이벤트)는 그 계정의 마지막 엔트리일 때만 삭제
+    user_id = entry.data[CONF_ID]
+    if not any(
+        other.entry_id != entry.entry_id and other.data.get(CONF_ID) == user_id
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        await async_remove_account_data(hass, user_id)
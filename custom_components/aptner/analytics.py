@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+
+from .const import DOMAIN, EVENT_MERGE_OVERLAP
+from .event_index import FLAG_IN, CarEvents
+
+# Days kept per car; older days are folded into the running sums
+ANALYTICS_RETENTION_DAYS = 400
+
+# Per-day counters: parked seconds, entries, completed visits, visit seconds
+_PARKED, _ENTRIES, _VISITS, _VISIT_SECONDS = range(4)
+
+_OVERLAP = EVENT_MERGE_OVERLAP.total_seconds()
+
+class CarParkingStats:
+    """Daily parking counters of one car, fed incrementally from its events."""
+
+    __slots__ = ("processed", "open_since", "days", "base", "tail")
+
+    def __init__(self) -> None:
+        # Epoch seconds of the newest event already counted
+        self.processed = 0.0
+        # Start of the visit in progress (car currently parked)
+        self.open_since: float | None = None
+        self.days: dict[str, list[float]] = {}
+        # Sums of days dropped by retention: parked seconds, entries
+        self.base = [0.0, 0.0]
+        # Events within the merge overlap before `processed` when last counted
+        self.tail = 0
+
+    def update(self, events: CarEvents, tz: tzinfo | None) -> set[str]:
+        """Count events newer than `processed`; return the ISO days touched.
+
+        The index still merges events up to its overlap window before the
+        newest one, so an event can land at or before `processed`. When the
+        overlap window holds more events than last time, the days from its
+        start on are counted again.
+        """
+        touched: set[str] = set()
+        if self._tail(events) > self.tail:
+            start, touched = self._recount_from(events, self.processed - _OVERLAP, tz)
+            first_day = min(touched, default="")
+        else:
+            start, first_day = bisect_right(events.times, self.processed), ""
+        for idx in range(start, len(events.times)):
+            ts = events.times[idx]
+            if events.flags[idx] == FLAG_IN:
+                day = self._day(ts, tz)
+                self._counters(day)[_ENTRIES] += 1
+                touched.add(day)
+                self.open_since = ts
+            elif self.open_since is not None:
+                touched |= self._add_visit(self.open_since, ts, tz, first_day)
+                self.open_since = None
+            self.processed = ts
+        self.tail = self._tail(events)
+        return touched
+
+    def _tail(self, events: CarEvents) -> int:
+        lo = bisect_left(events.times, self.processed - _OVERLAP)
+        return bisect_right(events.times, self.processed, lo) - lo
+
+    def _recount_from(
+        self, events: CarEvents, ts: float, tz: tzinfo | None
+    ) -> tuple[int, set[str]]:
+        """Drop the counters of the day of `ts` and later.
+
+        Returns the index of the first event to count again and the dropped
+        days. The visit open at that day's midnight is restored from the log.
+        """
+        first_day = self._day(ts, tz)
+        dropped = {day for day in self.days if day >= first_day}
+        for day in dropped:
+            del self.days[day]
+        dropped.add(first_day)
+        midnight = datetime.combine(date.fromisoformat(first_day), time.min, tz).timestamp()
+        idx = bisect_left(events.times, midnight)
+        if idx:
+            self.open_since = events.times[idx - 1] if events.flags[idx - 1] == FLAG_IN else None
+        elif events.last_in is not None and events.last_in < midnight and not (
+            events.last_out is not None and events.last_in <= events.last_out < midnight
+        ):
+            # 입차 기록이 보존 기간 밖으로 정리된 장기 주차
+            self.open_since = events.last_in
+        else:
+            self.open_since = None
+        return idx, dropped
+
+    def _counters(self, day: str) -> list[float]:
+        counters = self.days.get(day)
+        if counters is None:
+            counters = self.days[day] = [0.0, 0.0, 0.0, 0.0]
+        return counters
+
+    @staticmethod
+    def _day(ts: float, tz: tzinfo | None) -> str:
+        return datetime.fromtimestamp(ts, tz).date().isoformat()
+
+    def _add_visit(
+        self, start: float, end: float, tz: tzinfo | None, first_day: str = ""
+    ) -> set[str]:
+        """Split a visit's parked time over the days it spans (from first_day on)."""
+        touched: set[str] = set()
+        end_day = self._day(end, tz)
+        counters = self._counters(end_day)
+        counters[_VISITS] += 1
+        counters[_VISIT_SECONDS] += end - start
+        cursor = start
+        while cursor < end:
+            local = datetime.fromtimestamp(cursor, tz)
+            midnight = datetime.combine(local.date() + timedelta(days=1), time.min, local.tzinfo)
+            chunk_end = min(end, midnight.timestamp())
+            day = local.date().isoformat()
+            if day >= first_day:
+                self._counters(day)[_PARKED] += chunk_end - cursor
+                touched.add(day)
+            cursor = chunk_end
+        touched.add(end_day)
+        return touched
+
+    def prune(self, today: date) -> None:
+        """Fold days older than the retention window into the base sums."""
+        cutoff = (today - timedelta(days=ANALYTICS_RETENTION_DAYS)).isoformat()
+        for day in [d for d in self.days if d < cutoff]:
+            counters = self.days.pop(day)
+            self.base[0] += counters[_PARKED]
+            self.base[1] += counters[_ENTRIES]
+
+    def rows(self, since: str, tz: tzinfo | None) -> dict[str, list[dict[str, Any]]]:
+        """Return statistic rows for days >= since, with running sums."""
+        parked_sum, entries_sum = self.base
+        out: dict[str, list[dict[str, Any]]] = {"parked_time": [], "entries": [], "avg_visit": []}
+        for day in sorted(self.days):
+            counters = self.days[day]
+            parked_sum += counters[_PARKED]
+            entries_sum += counters[_ENTRIES]
+            if day < since:
+                continue
+            start = datetime.combine(date.fromisoformat(day), time.min, tz)
+            hours = counters[_PARKED] / 3600
+            out["parked_time"].append({"start": start, "state": round(hours, 3), "sum": round(parked_sum / 3600, 3)})
+            out["entries"].append({"start": start, "state": counters[_ENTRIES], "sum": entries_sum})
+            if counters[_VISITS]:
+                avg = counters[_VISIT_SECONDS] / counters[_VISITS] / 60
+                out["avg_visit"].append({"start": start, "mean": round(avg, 1), "min": round(avg, 1), "max": round(avg, 1)})
+        return out
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "open_since": self.open_since,
+            "days": self.days,
+            "base": self.base,
+            "tail": self.tail,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CarParkingStats:
+        stats = cls()
+        stats.processed = data["processed"]
+        stats.open_since = data["open_since"]
+        stats.days = data["days"]
+        stats.base = data["base"]
+        stats.tail = data.get("tail", 0)
+        return stats
+
+class ParkingAnalytics:
+    """Per-car parking analytics imported as long-term statistics.
+
+    Time parked per day, entries per day and average visit duration are
+    updated from the parking event index, touching only events newer than
+    each car's processed mark (or late ones merged within the index's
+    overlap window). Only days that changed are re-imported.
+    A visit is counted when the car exits.
+    """
+
+    def __init__(self, tz: tzinfo | None) -> None:
+        self.tz = tz
+        self.cars: dict[str, CarParkingStats] = {}
+
+    def update(self, cars: dict[str, CarEvents], tracked: list[str], today: date) -> dict[str, str]:
+        """Process new events of tracked cars; return {carno: earliest day touched}."""
+        touched: dict[str, str] = {}
+        for carno in tracked:
+            events = cars.get(carno)
+            if events is None:
+                continue
+            stats = self.cars.get(carno)
+            if stats is None:
+                stats = self.cars[carno] = CarParkingStats()
+            days = stats.update(events, self.tz)
+            stats.prune(today)
+            if days:
+                touched[carno] = min(days)
+        return touched
+
+    def async_import(self, hass: HomeAssistant, touched: dict[str, str]) -> None:
+        """Import the touched days of each car into the recorder."""
+        for carno, since in touched.items():
+            rows = self.cars[carno].rows(since, self.tz)
+            object_id = slugify(carno)
+            for kind, name, unit, has_sum in (
+                ("parked_time", "주차 시간", "h", True),
+                ("entries", "입차 횟수", None, True),
+                ("avg_visit", "평균 주차 시간", "min", False),
+            ):
+                if not rows[kind]:
+                    continue
+                metadata = StatisticMetaData(
+                    has_mean=not has_sum,
+                    has_sum=has_sum,
+                    name=f"Aptner {carno} {name}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{object_id}_{kind}",
+                    unit_of_measurement=unit,
+                )
+                async_add_external_statistics(
+                    hass, metadata, [StatisticData(**row) for row in rows[kind]]
+                )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {carno: stats.as_dict() for carno, stats in self.cars.items()}
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.cars = {carno: CarParkingStats.from_dict(stats) for carno, stats in data.items()}
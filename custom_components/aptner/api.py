@@ -2,44 +2,320 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any
+import time
+from collections import deque
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
 
-from aiohttp import ClientResponseError
+from aiohttp import ClientError, ClientResponseError, ClientTimeout
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import BASE_URL
+from .const import (
+    ACCESS_HISTORY_PATH,
+    ACCESS_REPORT_KEY,
+    BASE_URL,
+    CACHE_TTLS,
+    DATA_CLIENTS,
+    DATA_CONNECTIONS,
+    DEFAULT_EVENT_RETENTION,
+    DEFAULT_PAGE_CONCURRENCY,
+    DOMAIN,
+    MAX_CONCURRENT_CONNECTIONS,
+    MAX_RESERVE_PAGES,
+    REQUEST_BUDGET_WINDOW,
+    REQUEST_TIMEOUT,
+    STREAM_CHUNK_SIZE,
+    STREAM_MIN_SIZE,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_REFRESH_MAX_FRACTION,
+    TOKEN_REFRESH_MIN_DELAY,
+)
+from .event_index import ParkingEventIndex
+from .fee_cache import FeeCache
+from .metrics import ApiMetrics
+from .models import CarStatus, Fee, ReserveRange
+from .streaming import JsonArrayStreamer, iter_json_arrays
+from .resilience import CircuitBreaker, RetryPolicy, is_ambiguous, is_transient, retry_after
+from .token_store import AptnerTokenStore, account_key, token_expiry
 
 _LOGGER = logging.getLogger(__name__)
 
+EVENTS_STORAGE_VERSION = 1
+EVENTS_SAVE_DELAY = 30
+
 class AptnerError(Exception):
     """Base exception for Aptner."""
 
 class AptnerAuthError(AptnerError):
     """Raised when authentication fails."""
 
+class AptnerCircuitOpenError(AptnerError):
+    """Raised without a request while an endpoint's circuit breaker is open."""
+
+class AptnerNotFoundError(AptnerError):
+    """Raised when the API answers 404 (e.g. no fee data for the account)."""
+
+def async_connection_limit(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore capping concurrent connections to the Aptner API.
+
+    Shared by every client, so several accounts can't flood v2.aptner.com.
+    """
+    semaphore = hass.data.get(DATA_CONNECTIONS)
+    if semaphore is None:
+        semaphore = hass.data[DATA_CONNECTIONS] = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+    return semaphore
+
+async def async_acquire_client(hass: HomeAssistant, user_id: str, password: str) -> AptnerClient:
+    """Return the shared client for an account, creating it on first use.
+
+    Clients are reference-counted per account so several config entries for
+    the same account share one token, response cache and request budget.
+    """
+    clients: dict[str, dict[str, Any]] = hass.data.setdefault(DATA_CLIENTS, {})
+    ref = clients.get(user_id)
+    if ref is None:
+        client = AptnerClient(hass, user_id=user_id, password=password)
+        # 로드가 끝나기 전에 설정되는 같은 계정의 엔트리도 이 클라이언트를 받도록 먼저 등록
+        ref = clients[user_id] = {
+            "client": client,
+            "refs": 0,
+            "loaded": hass.async_create_task(client.async_load(), f"{DOMAIN} client load"),
+        }
+    ref["refs"] += 1
+    try:
+        await asyncio.shield(ref["loaded"])
+    except BaseException:
+        await async_release_client(hass, user_id)
+        raise
+    return ref["client"]
+
+async def async_release_client(hass: HomeAssistant, user_id: str) -> None:
+    """Drop one reference to an account's client, closing it when unused."""
+    clients: dict[str, dict[str, Any]] = hass.data.get(DATA_CLIENTS, {})
+    ref = clients.get(user_id)
+    if ref is None:
+        return
+    ref["refs"] -= 1
+    if ref["refs"] <= 0:
+        del clients[user_id]
+        await ref["client"].async_close()
+
+def events_store(hass: HomeAssistant, user_id: str) -> Store[dict[str, Any]]:
+    """Return the Store holding an account's parking event index."""
+    return Store(hass, EVENTS_STORAGE_VERSION, f"{DOMAIN}.events_{account_key(user_id)}")
+
+async def async_remove_account_data(hass: HomeAssistant, user_id: str) -> None:
+    """Remove an account's persisted token, fee cache and event index."""
+    await AptnerTokenStore(hass, user_id).async_remove()
+    await FeeCache(hass, user_id).async_remove()
+    await events_store(hass, user_id).async_remove()
+
+def parse_reserve_page(reserved: dict, today: date) -> tuple[dict[str, list[date]], bool]:
+    """Parse one reserve page into {carNo: [reserved dates >= today]}.
+
+    A row books `days` consecutive days from its visitDate. The second
+    value is True when the page has rows and all of them ended before
+    today; pages are ordered newest first, so later pages can only hold
+    older reservations.
+    """
+    result: dict[str, list[date]] = {}
+    rows = reserved.get("reserveList") or []
+    past = bool(rows)
+    for item in rows:
+        visit_date_str = item.get("visitDate")
+        try:
+            visit_date = datetime.strptime(visit_date_str, "%Y.%m.%d").date()
+        except Exception:
+            past = False
+            continue
+        last_date = visit_date + timedelta(days=reserve_days(item) - 1)
+        if today <= last_date:
+            past = False
+            car_no = item.get("carNo")
+            if not car_no:
+                continue
+            # 진행 중인 예약은 오늘부터
+            first_date = max(visit_date, today)
+            result.setdefault(car_no, []).extend(
+                first_date + timedelta(days=offset)
+                for offset in range((last_date - first_date).days + 1)
+            )
+    return result, past
+
+def reserve_days(item: dict) -> int:
+    """Return the number of days a reserve row books (1 if missing or invalid)."""
+    try:
+        return max(1, int(item.get("days") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+def compress_ranges(dates: Iterable[date]) -> list[ReserveRange]:
+    """Compress visit dates into consecutive ranges."""
+    dates = sorted(set(dates))
+    ranges: list[ReserveRange] = []
+    start = dates[0]
+    for i in range(1, len(dates)):
+        prev = dates[i - 1]
+        cur = dates[i]
+        if (cur - prev) > timedelta(days=1):
+            ranges.append(ReserveRange(start, prev))
+            start = cur
+    ranges.append(ReserveRange(start, dates[-1]))
+    return ranges
+
 class AptnerClient:
-    def __init__(self, hass, user_id: str, password: str) -> None:
+    def __init__(
+        self,
+        hass,
+        user_id: str,
+        password: str,
+        *,
+        page_concurrency: int = DEFAULT_PAGE_CONCURRENCY,
+        base_url: str = BASE_URL,
+        event_retention: timedelta = DEFAULT_EVENT_RETENTION,
+    ) -> None:
         self._hass = hass
+        self._base_url = base_url.rstrip("/")
         self._id = user_id
         self._password = password
+        self._page_concurrency = max(1, page_concurrency)
         self._token: str | None = None
+        self._token_expires: float | None = None
+        self._token_margin = 0.0
+        self._token_store = AptnerTokenStore(hass, user_id)
+        self.fee_cache = FeeCache(hass, user_id)
+        # Epoch seconds of the last access-history merge
+        self.events_refreshed_at = 0.0
+        self.events = ParkingEventIndex(event_retention.total_seconds(), dt_util.DEFAULT_TIME_ZONE)
+        self._events_store = events_store(hass, user_id)
+        self._refresh_unsub: CALLBACK_TYPE | None = None
         self._auth_lock = asyncio.Lock()
+        # Response cache: key -> (expires_at, data), plus in-flight tasks and their callers
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_coalesced = 0
+        self.metrics = ApiMetrics()
+        self._retry_policy = RetryPolicy()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # Monotonic timestamps of network requests in the last hour
+        self._request_times: deque[float] = deque()
 
     @property
     def _session(self):
         return async_get_clientsession(self._hass)
 
+    @property
+    def token(self) -> str | None:
+        """Return the current access token."""
+        return self._token
+
+    async def async_load(self) -> None:
+        """Load the persisted access token and parking event index."""
+        token = await self._token_store.async_load()
+        if token and not self._token:
+            # Reuse a persisted access token, if one is still valid
+            self._set_token(token, persist=False)
+        stored = await self._events_store.async_load()
+        if stored:
+            self.events.load(stored)
+        await self.fee_cache.async_load()
+
+    async def async_save_token(self) -> None:
+        """Write the current access token to storage now."""
+        if self._token:
+            await self._token_store.async_save(self._token)
+
+    async def async_close(self) -> None:
+        """Cancel the scheduled token refresh."""
+        if self._refresh_unsub is not None:
+            self._refresh_unsub()
+            self._refresh_unsub = None
+
+    def _set_token(self, token: str, *, persist: bool) -> None:
+        self._token = token
+        expires = token_expiry(token)
+        now = time.time()
+        if expires is not None and expires <= now:
+            # 시계가 어긋나 새 토큰이 이미 만료로 보이면 401 처리에 맡김
+            _LOGGER.debug("Access token expiry is in the past; ignoring it")
+            expires = None
+        self._token_expires = expires
+        # 수명이 짧은 토큰은 여유시간을 남은 수명의 일부로 제한
+        self._token_margin = (
+            min(TOKEN_REFRESH_MARGIN, (expires - now) * TOKEN_REFRESH_MAX_FRACTION)
+            if expires is not None
+            else 0.0
+        )
+        if persist:
+            self._token_store.async_delay_save(token)
+        self._schedule_token_refresh()
+
+    def _token_expiring(self) -> bool:
+        return (
+            self._token_expires is not None
+            and self._token_expires - self._token_margin <= time.time()
+        )
+
+    def _schedule_token_refresh(self) -> None:
+        if self._refresh_unsub is not None:
+            self._refresh_unsub()
+            self._refresh_unsub = None
+        if self._token_expires is None:
+            return
+        delay = max(
+            TOKEN_REFRESH_MIN_DELAY,
+            self._token_expires - self._token_margin - time.time(),
+        )
+        self._refresh_unsub = async_call_later(self._hass, delay, self._async_token_refresh_due)
+
+    @callback
+    def _async_token_refresh_due(self, _now) -> None:
+        self._refresh_unsub = None
+        self._hass.async_create_background_task(
+            self._async_proactive_refresh(), f"{DOMAIN} token refresh"
+        )
+
+    async def _async_proactive_refresh(self) -> None:
+        try:
+            await self._ensure_token()
+        except Exception as err:
+            # 다음 요청에서 다시 시도 (401 처리 경로 유지)
+            _LOGGER.warning("Proactive token refresh failed: %s", err)
+
+    async def _ensure_token(self) -> None:
+        """Authenticate ahead of time if there is no token or it is about to expire."""
+        if self._token and not self._token_expiring():
+            return
+        stale = self._token
+        async with self._auth_lock:
+            if self._token != stale and self._token and not self._token_expiring():
+                # 다른 호출이 이미 갱신함
+                return
+            await self._authenticate_locked()
+
     async def authenticate(self) -> None:
         """Obtain a new access token."""
         async with self._auth_lock:
-            payload = {"id": self._id, "password": self._password}
-            data = await self._raw_request("POST", "/auth/token", json=payload, auth=False)
-            token = None
-            if isinstance(data, dict):
-                token = data.get("accessToken")
-            if not token:
-                raise AptnerAuthError("Failed to obtain accessToken")
-            self._token = token
+            await self._authenticate_locked()
+
+    async def _authenticate_locked(self) -> None:
+        payload = {"id": self._id, "password": self._password}
+        data = await self._raw_request("POST", "/auth/token", json=payload, auth=False)
+        token = None
+        if isinstance(data, dict):
+            token = data.get("accessToken")
+        if not token:
+            raise AptnerAuthError("Failed to obtain accessToken")
+        self._set_token(token, persist=True)
 
     async def _raw_request(
         self,
@@ -53,211 +329,445 @@ class AptnerClient:
         if auth and self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        url = f"{BASE_URL}{path}"
-        async with self._session.request(method, url, headers=headers, json=json) as resp:
-            if resp.status >= 400:
-                # Keep body for debugging
-                body = await resp.text()
-                raise ClientResponseError(
-                    resp.request_info,
-                    resp.history,
-                    status=resp.status,
-                    message=body,
-                    headers=resp.headers,
-                )
+        url = f"{self._base_url}{path}"
+        metrics = self.metrics.endpoint(path)
+        async with async_connection_limit(self._hass):
+            start = time.monotonic()
+            self._prune_request_times(start)
+            self._request_times.append(start)
             try:
-                return await resp.json()
+                async with self._session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=json,
+                    timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+                ) as resp:
+                    body = await resp.read()
+                    latency = time.monotonic() - start
+                    if resp.status >= 400:
+                        metrics.observe(latency, len(body), ok=False)
+                        # Keep body for debugging
+                        raise ClientResponseError(
+                            resp.request_info,
+                            resp.history,
+                            status=resp.status,
+                            message=body.decode("utf-8", "replace"),
+                            headers=resp.headers,
+                        )
+            except ClientResponseError:
+                raise
             except Exception:
-                return None
+                metrics.observe(time.monotonic() - start, ok=False)
+                raise
+
+        parse_start = time.monotonic()
+        try:
+            data = json_loads(body) if body else None
+        except ValueError:
+            data = None
+        metrics.observe(latency, len(body), time.monotonic() - parse_start)
+        return data
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Return response cache counters."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "coalesced": self.cache_coalesced,
+            "entries": len(self._cache),
+        }
+
+    def _prune_request_times(self, now: float) -> None:
+        times = self._request_times
+        while times and times[0] <= now - REQUEST_BUDGET_WINDOW:
+            times.popleft()
+
+    @property
+    def requests_last_hour(self) -> int:
+        """Return the number of network requests made in the budget window."""
+        self._prune_request_times(time.monotonic())
+        return len(self._request_times)
+
+    def budget_wait(self, budget: int) -> float:
+        """Seconds until another request fits in `budget` requests per hour."""
+        now = time.monotonic()
+        self._prune_request_times(now)
+        times = self._request_times
+        if len(times) < budget:
+            return 0
+        return times[len(times) - budget] + REQUEST_BUDGET_WINDOW - now
+
+    def invalidate_cache(self, prefix: str = "") -> None:
+        """Drop cached responses whose key starts with prefix."""
+        for key in [k for k in self._cache if k.startswith(prefix)]:
+            del self._cache[key]
+
+    async def _coalesce(
+        self, key: str, ttl: float, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve key from cache, join an in-flight call, or run factory once.
+
+        The factory runs in its own task, which every caller awaits through
+        a shield, so cancelling one caller (e.g. unloading one of several
+        entries sharing this client) doesn't cancel the others. The task is
+        cancelled only when its last caller goes away.
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.cache_hits += 1
+                return cached[1]
+            del self._cache[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.cache_coalesced += 1
+        else:
+            self.cache_misses += 1
+            task = self._inflight[key] = asyncio.get_running_loop().create_task(
+                self._fill_cache(key, ttl, factory), name=f"{DOMAIN} {key}"
+            )
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                # 마지막 대기자가 취소되면 공유 요청도 취소
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    async def _fill_cache(
+        self, key: str, ttl: float, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run a coalesced factory and cache its result."""
+        try:
+            data = await factory()
+            self._cache[key] = (time.monotonic() + ttl, data)
+            return data
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
 
     async def request(self, method: str, path: str, *, json: dict | None = None) -> Any:
-        """Request with auto re-auth on 401 and retry on other errors."""
-        max_retries = 3
-        base_delay = 1  # 초
-        
-        for attempt in range(max_retries):
-            try:
-                return await self._raw_request(method, path, json=json, auth=True)
-            except ClientResponseError as e:
-                # 401 에러: 인증 갱신 시도
-                if e.status == 401 and path != "/auth/token":
-                    if attempt == 0:  # 첫 번째 시도에서만 인증 갱신
-                        try:
-                            await self.authenticate()
-                        except Exception as auth_error:
-                            _LOGGER.warning("Authentication failed during retry: %s", auth_error)
-                    else:
-                        _LOGGER.warning("401 error persists after re-authentication")
-                    continue
-                # 다른 HTTP 에러나 네트워크 오류
-                elif attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    _LOGGER.warning(
-                        "Request failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
-                        attempt + 1, max_retries, str(e), delay
-                    )
-                    await asyncio.sleep(delay)
-                    continue
-                else:
-                    _LOGGER.error("Request failed after %d attempts: %s", max_retries, str(e))
-                    raise
-            except Exception as e:  # 네트워크 에러, 타임아웃 등
-                if attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    _LOGGER.warning(
-                        "Request failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
-                        attempt + 1, max_retries, str(e), delay
-                    )
-                    await asyncio.sleep(delay)
-                    continue
-                else:
-                    _LOGGER.error("Request failed after %d attempts: %s", max_retries, str(e))
-                    raise
-        
-        # 마지막 재시도 후 인증 갱신 시도 (401이 아니더라도)
+        """Request through the response cache (GET only)."""
+        if method == "GET":
+            ttl = CACHE_TTLS.get(path.split("?", 1)[0])
+            if ttl:
+                return await self._coalesce(
+                    path, ttl, lambda: self._request(method, path, json=json)
+                )
+        data = await self._request(method, path, json=json)
+        if path.startswith("/pc/reserve"):
+            # 예약 변경 후 예약 목록 캐시 무효화
+            self.invalidate_cache("/pc/reserves")
+        return data
+
+    async def _request(self, method: str, path: str, *, json: dict | None = None) -> Any:
+        """Request with auto re-auth on 401 and retry on transient errors."""
         if path != "/auth/token":
+            await self._ensure_token()
+        return await self._call(
+            path,
+            lambda: self._raw_request(method, path, json=json, auth=True),
+            idempotent=method == "GET",
+        )
+
+    def breaker(self, path: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint (query string ignored)."""
+        endpoint = path.split("?", 1)[0]
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker()
+        return breaker
+
+    @property
+    def breaker_states(self) -> dict[str, dict[str, Any]]:
+        """Return circuit breaker state per endpoint."""
+        return {endpoint: breaker.as_dict() for endpoint, breaker in self._breakers.items()}
+
+    async def _call(
+        self,
+        path: str,
+        attempt: Callable[[], Awaitable[Any]],
+        *,
+        idempotent: bool = True,
+    ) -> Any:
+        """Run one API call under the retry policy and the endpoint's breaker.
+
+        Only transient errors (5xx, 429, timeouts, connection resets) are
+        retried, honoring Retry-After, with jittered back-off inside the
+        policy's total time budget. Non-idempotent calls (e.g. a reservation
+        POST) are not retried when the server may already have processed
+        them. A 401 triggers one re-authentication.
+        """
+        breaker = self.breaker(path)
+        if not breaker.allow():
+            raise AptnerCircuitOpenError(
+                f"Circuit open for {path.split('?', 1)[0]}; "
+                f"retry in {breaker.retry_in():.0f}s"
+            )
+
+        policy = self._retry_policy
+        deadline = time.monotonic() + policy.budget
+        reauthenticated = False
+        retries = 0
+        while True:
             try:
-                await self.authenticate()
-            except Exception as auth_error:
-                _LOGGER.warning("Final authentication attempt failed: %s", auth_error)
-        
-        # 마지막 시도
-        return await self._raw_request(method, path, json=json, auth=True)
+                result = await attempt()
+            except ClientResponseError as err:
+                if err.status == 401 and path != "/auth/token" and not reauthenticated:
+                    # 401 에러: 인증 갱신 후 한 번만 재시도
+                    reauthenticated = True
+                    self.metrics.endpoint(path).reauths += 1
+                    await self.authenticate()
+                    continue
+                error: Exception = err
+            except (asyncio.TimeoutError, ClientError) as err:
+                error = err
+            else:
+                breaker.record_success()
+                return result
+
+            if not is_transient(error):
+                # 서버는 응답했으므로 영구 오류(4xx)는 재시도하지 않음
+                breaker.record_success()
+                if isinstance(error, ClientResponseError) and error.status == 404:
+                    raise AptnerNotFoundError(error.message) from error
+                raise error
+
+            if not idempotent and is_ambiguous(error):
+                # 서버가 이미 처리했을 수 있으므로 재시도하지 않음 (중복 예약 방지)
+                breaker.record_failure()
+                _LOGGER.error("Request %s failed and was not retried: %s", path, error)
+                raise error
+
+            delay = retry_after(error)
+            if delay is None:
+                delay = policy.backoff(retries)
+            retries += 1
+            if retries >= policy.max_attempts or time.monotonic() + delay > deadline:
+                breaker.record_failure()
+                _LOGGER.error("Request %s failed after %d attempts: %s", path, retries, error)
+                raise error
+            _LOGGER.warning(
+                "Request %s failed (attempt %d/%d): %s. Retrying in %.1f seconds...",
+                path, retries, policy.max_attempts, error, delay,
+            )
+            self.metrics.endpoint(path).retries += 1
+            await asyncio.sleep(delay)
 
     # ---- High-level API (mirrors pyscript services) ----
 
-    async def get_fee(self) -> dict:
-        data = await self.request("GET", "/fee/detail")
-        fee = data["fee"]
-        return {
-            "year": fee.get("year"),
-            "month": fee.get("month"),
-            "fee": fee.get("currentFee"),
-            "details": {item["name"]: item["value"] for item in fee.get("details", [])},
-        }
+    async def get_fee(self, *, force: bool = False) -> Fee:
+        """Return the latest bill, from the billing-cycle cache when fresh.
+
+        Raises AptnerNotFoundError if the account has no fee data.
+        """
+        cache = self.fee_cache
+        now = time.time()
+        if not force and cache.is_fresh(now):
+            if cache.missing:
+                raise AptnerNotFoundError("No fee data for this account (cached)")
+            return cache.fee
+        try:
+            data = await self.request("GET", "/fee/detail")
+        except AptnerNotFoundError:
+            cache.set_missing(now)
+            raise
+        fee = Fee.from_api(data["fee"])
+        cache.set_fee(fee, now)
+        return fee
+
+    async def _raw_stream(self, path: str, key: str) -> AsyncIterator[Any]:
+        """GET path and yield the elements of every array under key.
+
+        A response up to STREAM_MIN_SIZE is read and parsed whole. A larger
+        one switches to the streaming parser, and its elements are yielded
+        as they arrive. Downloads time out per read rather than in total, so
+        a large response that keeps arriving isn't cut off.
+        """
+        headers = {"Content-Type": "application/json"}
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+
+        url = f"{self._base_url}{path}"
+        metrics = self.metrics.endpoint(path)
+        async with async_connection_limit(self._hass):
+            start = time.monotonic()
+            self._prune_request_times(start)
+            self._request_times.append(start)
+            size = 0
+            parse_time = 0.0
+            try:
+                async with self._session.get(
+                    url,
+                    headers=headers,
+                    timeout=ClientTimeout(
+                        total=None, connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT
+                    ),
+                ) as resp:
+                    if resp.status >= 400:
+                        body = await resp.read()
+                        metrics.observe(time.monotonic() - start, len(body), ok=False)
+                        raise ClientResponseError(
+                            resp.request_info,
+                            resp.history,
+                            status=resp.status,
+                            message=body.decode("utf-8", "replace"),
+                            headers=resp.headers,
+                        )
+                    head: bytearray | None = bytearray()
+                    parser: JsonArrayStreamer | None = None
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        size += len(chunk)
+                        if parser is None:
+                            head += chunk
+                            if len(head) <= STREAM_MIN_SIZE:
+                                continue
+                            # 큰 응답만 스트리밍 파서로 전환
+                            parser = JsonArrayStreamer(key, json_loads)
+                            chunk, head = bytes(head), None
+                        parse_start = time.monotonic()
+                        items = list(parser.feed(chunk))
+                        parse_time += time.monotonic() - parse_start
+                        for item in items:
+                            yield item
+                    if parser is None:
+                        parse_start = time.monotonic()
+                        try:
+                            items = list(iter_json_arrays(json_loads(head) if head else None, key))
+                        except ValueError:
+                            items = []
+                        parse_time += time.monotonic() - parse_start
+                        for item in items:
+                            yield item
+            except ClientResponseError:
+                raise
+            except Exception:
+                metrics.observe(time.monotonic() - start, size, parse_time, ok=False)
+                raise
+        metrics.observe(time.monotonic() - start, size, parse_time)
+
+    async def _refresh_events(self) -> set[str]:
+        """Merge new access reports into the parking event index.
+
+        Each report is reduced into the merge batch as it is read (only
+        events past the index's overlap floor are parsed); a very large
+        response is streamed, so memory stays proportional to the new events
+        rather than the number of reports. Concurrent callers share one
+        download (see _coalesce).
+        Returns the cars whose events changed.
+        """
+
+        async def merge_stream() -> set[str]:
+            batch = self.events.batch()
+            async for report in self._raw_stream(ACCESS_HISTORY_PATH, ACCESS_REPORT_KEY):
+                batch.add(report)
+            changed = self.events.commit(batch, time.time())
+            self.events_refreshed_at = time.time()
+            self._events_store.async_delay_save(self.events.as_dict, EVENTS_SAVE_DELAY)
+            return changed
+
+        async def fetch() -> set[str]:
+            await self._ensure_token()
+            return await self._call(ACCESS_HISTORY_PATH, merge_stream)
 
-    async def find_car(self, carno: str | None = None) -> dict:
+        return await self._coalesce(
+            ACCESS_HISTORY_PATH, CACHE_TTLS[ACCESS_HISTORY_PATH], fetch
+        )
+
+    async def _ensure_events(self, max_age: float | None) -> None:
+        """Refresh the event index unless it is at most max_age seconds old."""
+        if max_age is None or time.time() - self.events_refreshed_at > max_age:
+            if max_age is not None and max_age < CACHE_TTLS[ACCESS_HISTORY_PATH]:
+                # 캐시된 응답이 max_age보다 오래됐을 수 있으므로 새로 받음
+                self.invalidate_cache(ACCESS_HISTORY_PATH)
+            await self._refresh_events()
+
+    async def find_car(self, carno: str | None = None, *, max_age: float | None = None) -> dict:
         """Find car entry/exit records (기존 기능 유지)."""
-        monthly_access = await self.request("GET", "/pc/monthly-access-history")
+        await self._ensure_events(max_age)
+        cars = self.events.cars
+        if carno is not None:
+            cars = {carno: cars[carno]} if carno in cars else {}
         response: dict[str, dict[str, Any]] = {}
-        for monthly_parking in monthly_access.get("monthlyParkingHistoryList", []):
-            for report in monthly_parking.get("visitCarUseHistoryReportList", []):
-                if carno is None or report.get("carNo") == carno:
-                    cno = report.get("carNo")
-                    if not cno:
-                        continue
-                    if cno not in response:
-                        response[cno] = {
-                            "status": "out" if report.get("isExit") else "in",
-                        }
-                        if report.get("inDatetime") is not None:
-                            response[cno]["intime"] = report.get("inDatetime")
-                        if report.get("outDatetime") is not None:
-                            response[cno]["outtime"] = report.get("outDatetime")
-                    if report.get("carNo") == carno:
-                        break
+        for cno, car in cars.items():
+            response[cno] = {
+                "status": "out" if car.is_exit else "in",
+            }
+            if car.last_in_raw is not None:
+                response[cno]["intime"] = car.last_in_raw
+            if car.is_exit and car.last_out_raw is not None:
+                response[cno]["outtime"] = car.last_out_raw
         return response
 
-    async def get_car_status(self, carno: str | None = None) -> dict:
+    async def get_car_status(
+        self, carno: str | None = None, *, max_age: float | None = None
+    ) -> dict[str, CarStatus]:
         """Get current car status for device_tracker (새로운 메서드)."""
-        monthly_access = await self.request("GET", "/pc/monthly-access-history")
-        response = {}
+        await self._ensure_events(max_age)
         
-        # 모든 차량의 가장 최근 기록 찾기
-        latest_records = {}
-        
-        for monthly_parking in monthly_access.get("monthlyParkingHistoryList", []):
-            for report in monthly_parking.get("visitCarUseHistoryReportList", []):
-                cno = report.get("carNo")
-                if not cno:
-                    continue
-                    
-                # 특정 차량만 요청한 경우 필터링
-                if carno is not None and cno != carno:
-                    continue
-                    
-                # 가장 최근 기록만 저장 (datetime 비교)
-                report_time = report.get("inDatetime") or report.get("outDatetime")
-                if report_time:
-                    if cno not in latest_records:
-                        latest_records[cno] = report
-                    else:
-                        # 이미 있는 기록보다 최신인지 확인
-                        existing_time = latest_records[cno].get("inDatetime") or latest_records[cno].get("outDatetime")
-                        if report_time > existing_time:
-                            latest_records[cno] = report
+        # 인덱스에서 차량별 최신 상태를 O(1)로 조회
+        if carno is None:
+            return {cno: self.events.status(cno) for cno in self.events.cars}
         
-        # 결과 구성
-        for cno, report in latest_records.items():
-            response[cno] = {
-                "carNo": cno,
-                "isExit": report.get("isExit", True),
-                "inDatetime": report.get("inDatetime"),
-                "outDatetime": report.get("outDatetime"),
-                "status": "out" if report.get("isExit") else "in"
-            }
-        
-        # 특정 차량 요청했는데 데이터가 없는 경우
-        if carno is not None and carno not in response:
-            response[carno] = {
-                "carNo": carno,
-                "isExit": True,  # 기본값 not_home
-                "inDatetime": None,
-                "outDatetime": None,
-                "intime": None,
-                "outtime": None,
-                "status": "not_found"
-            }
-        
-        return response
+        # 특정 차량 요청했는데 데이터가 없는 경우 not_found
+        return {carno: self.events.status(carno) or CarStatus.not_found(carno)}
 
-    async def get_reserve_status(self) -> dict:
-        # Matches pyscript: fetch all pages and compress into ranges per car
-        from datetime import datetime, timedelta, date
+    async def async_iter_reserve_pages(self) -> AsyncIterator[tuple[int, dict | None]]:
+        """Yield (page, data) for /pc/reserves pages, in page order.
 
-        total_pages = 0
-        current_page = 0
+        Page 1 is fetched first to learn totalPages; the remaining pages are
+        fetched concurrently in windows of page_concurrency, so a consumer
+        that stops iterating stops further downloads. A failed page yields
+        None instead of aborting the walk.
+        """
+        first = await self.request("GET", "/pc/reserves?pg=1")
+        yield 1, first
+        total_pages = int(first.get("totalPages", 0) or 0)
+        if not total_pages:
+            # Safety cap if API doesn't return totalPages
+            total_pages = MAX_RESERVE_PAGES
+
+        page = 2
+        while page <= total_pages:
+            window = range(page, min(page + self._page_concurrency, total_pages + 1))
+            results = await asyncio.gather(
+                *(self.request("GET", f"/pc/reserves?pg={pg}") for pg in window),
+                return_exceptions=True,
+            )
+            for pg, result in zip(window, results):
+                if isinstance(result, BaseException):
+                    _LOGGER.warning("Failed to fetch reserve page %d: %s", pg, result)
+                    yield pg, None
+                else:
+                    yield pg, result
+            page = window.stop
+
+    async def get_reserve_status(self) -> dict[str, list[ReserveRange]]:
+        # Matches pyscript: fetch all pages and compress into ranges per car
         today = date.today()
         result: dict[str, list[date]] = {}
 
-        while True:
-            current_page += 1
-            reserved = await self.request("GET", f"/pc/reserves?pg={current_page}")
-            if total_pages == 0:
-                total_pages = int(reserved.get("totalPages", 0) or 0)
-            for item in reserved.get("reserveList", []):
-                visit_date_str = item.get("visitDate")
-                try:
-                    visit_date = datetime.strptime(visit_date_str, "%Y.%m.%d").date()
-                except Exception:
+        async with aclosing(self.async_iter_reserve_pages()) as pages:
+            async for _, reserved in pages:
+                if reserved is None:
                     continue
-                if today <= visit_date:
-                    car_no = item.get("carNo")
-                    if not car_no:
-                        continue
-                    result.setdefault(car_no, []).append(visit_date)
-
-            if total_pages and current_page >= total_pages:
-                break
-            if not total_pages and current_page >= 20:
-                # Safety break if API doesn't return totalPages
-                break
-
-        # Compress to ranges
-        out: dict[str, list[dict[str, str]]] = {}
-        for car, dates in result.items():
-            dates.sort()
-            ranges: list[dict[str, str]] = []
-            start = dates[0]
-            for i in range(1, len(dates)):
-                prev = dates[i - 1]
-                cur = dates[i]
-                if (cur - prev) > timedelta(days=1):
-                    ranges.append({"from": start.isoformat(), "to": prev.isoformat()})
-                    start = cur
-            ranges.append({"from": start.isoformat(), "to": dates[-1].isoformat()})
-            out[car] = ranges
-        return out
+                cars, past = parse_reserve_page(reserved, today)
+                for car_no, dates in cars.items():
+                    result.setdefault(car_no, []).extend(dates)
+                if past:
+                    break
+
+        return {car: compress_ranges(dates) for car, dates in result.items()}
 
     async def reserve_car(self, *, date: str, purpose: str, carno: str, days: int, phone: str) -> None:
         payload = {
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SOURCE_RESERVE
+from .coordinator import AptnerDataCoordinator
+from .entity import AptnerEntity, entry_device_info
+from .models import ReserveRange
+from .reserve_index import ReservationIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
+    """Set up the Aptner reservation calendar from a config entry."""
+    _LOGGER.debug("Setting up calendar for entry: %s", entry.entry_id)
+
+    coordinator: AptnerDataCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    async_add_entities([AptnerReserveCalendar(entry, coordinator)])
+
+def _to_event(carno: str, reserved: ReserveRange) -> CalendarEvent:
+    """Return an all-day calendar event for a reserved range."""
+    return CalendarEvent(
+        start=reserved.start,
+        end=reserved.end + timedelta(days=1),  # 종일 일정은 종료일 미포함
+        summary=f"{carno} 방문",
+        uid=f"{carno}_{reserved.start.isoformat()}",
+    )
+
+class AptnerReserveCalendar(AptnerEntity, CalendarEntity):
+    """Calendar of visitor car reservations."""
+
+    _attr_has_entity_name = True
+    _attr_name = "방문차량 예약"
+    _attr_icon = "mdi:calendar-clock"
+
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
+        """Initialize the reservation calendar."""
+        # context = 데이터 소스; 예약 데이터가 바뀔 때만 상태 갱신
+        super().__init__(coordinator, context=SOURCE_RESERVE)
+        self._attr_unique_id = f"{entry.entry_id}_reserve_calendar"
+        self._attr_device_info = entry_device_info(entry)
+
+    @property
+    def has_data(self) -> bool:
+        """Return True once reservations have been fetched."""
+        return (self.coordinator.data or {}).get(SOURCE_RESERVE) is not None
+
+    @property
+    def index(self) -> ReservationIndex:
+        """Return the reservation index kept by the reserve sync."""
+        return self.coordinator.reserve_sync.index
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the reservation in progress today, or the next one."""
+        found = self.index.next_from(dt_util.now().date())
+        return _to_event(*found) if found is not None else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return reservations overlapping [start_date, end_date)."""
+        start = dt_util.as_local(start_date).date()
+        # 종료 시각은 미포함이므로 자정이면 전날까지
+        end = dt_util.as_local(end_date - timedelta(microseconds=1)).date()
+        return [_to_event(carno, reserved) for carno, reserved in self.index.overlapping(start, end)]
@@ -14,8 +14,13 @@ from .const import (
     CONF_PASSWORD,
     CONF_CARS,
     CONF_SCAN_INTERVAL_MIN,
+    CONF_ACTIVE_HOURS,
+    CONF_REQUEST_BUDGET,
     DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_ACTIVE_HOURS,
+    DEFAULT_REQUEST_BUDGET,
 )
+from .scheduler import parse_active_hours
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,11 +33,16 @@ class AptnerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             client = AptnerClient(self.hass, user_input[CONF_ID], user_input[CONF_PASSWORD])
             try:
                 await client.authenticate()
+                # 엔트리의 클라이언트가 시작할 때 읽을 수 있도록 토큰 저장을 기다림
+                await client.async_save_token()
             except Exception as ex:
                 _LOGGER.error("Authentication failed: %s", ex)
                 errors["base"] = "auth_failed"
             else:
                 return self.async_create_entry(title="Aptner", data=user_input)
+            finally:
+                # 검증용 클라이언트의 토큰 갱신 타이머 해제
+                await client.async_close()
 
         schema = vol.Schema(
             {
@@ -66,11 +76,22 @@ class AptnerOptionsFlowHandler(config_entries.OptionsFlow):
                 if not (5 <= scan_interval <= 1440):
                     errors[CONF_SCAN_INTERVAL_MIN] = "invalid_interval"
                 
+                # Validate active hours (e.g. "7-9, 18-22")
+                active_hours = user_input.get(CONF_ACTIVE_HOURS, DEFAULT_ACTIVE_HOURS).strip()
+                try:
+                    parse_active_hours(active_hours)
+                except ValueError:
+                    errors[CONF_ACTIVE_HOURS] = "invalid_active_hours"
+
+                request_budget = int(user_input.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET))
+
                 if not errors:
                     # Create options entry
                     options = {
                         CONF_CARS: cars,
                         CONF_SCAN_INTERVAL_MIN: scan_interval,
+                        CONF_ACTIVE_HOURS: active_hours,
+                        CONF_REQUEST_BUDGET: request_budget,
                     }
                     
                     _LOGGER.debug("Saving options: %s", options)
@@ -96,6 +117,8 @@ class AptnerOptionsFlowHandler(config_entries.OptionsFlow):
             cars_str = str(cars_existing)
             
         scan_interval = self.entry.options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN)
+        active_hours = self.entry.options.get(CONF_ACTIVE_HOURS, DEFAULT_ACTIVE_HOURS)
+        request_budget = self.entry.options.get(CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
 
         schema = vol.Schema(
             {
@@ -104,6 +127,11 @@ class AptnerOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Coerce(int), 
                     vol.Range(min=5, max=1440)
                 ),
+                vol.Optional(CONF_ACTIVE_HOURS, default=active_hours): str,
+                vol.Optional(CONF_REQUEST_BUDGET, default=request_budget): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=10, max=3600)
+                ),
             }
         )
         return self.async_show_form(
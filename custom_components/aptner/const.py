@@ -1,12 +1,100 @@
+from datetime import timedelta
+
 DOMAIN = "aptner"
 
+# hass.data keys shared across config entries
+DATA_CLIENTS = f"{DOMAIN}_clients"
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+
 CONF_ID = "id"
 CONF_PASSWORD = "password"
 CONF_CARS = "cars"
 CONF_SCAN_INTERVAL_MIN = "scan_interval_minutes"
+CONF_ACTIVE_HOURS = "active_hours"
+CONF_REQUEST_BUDGET = "request_budget"
 
 DEFAULT_SCAN_INTERVAL_MIN = 5
+DEFAULT_ACTIVE_HOURS = ""
+# Max API requests per hour per account
+DEFAULT_REQUEST_BUDGET = 120
+REQUEST_BUDGET_WINDOW = 3600
+
+# Data sources of the per-entry coordinator (also used as entity contexts)
+SOURCE_FEE = "fee"
+SOURCE_RESERVE = "reserve"
+SOURCE_CARS = "cars"
+# Pseudo source for API metrics sensors (changes on every fetch)
+SOURCE_METRICS = "metrics"
+
+# Events fired when a tracked car enters / leaves the parking lot
+EVENT_CAR_ENTERED = f"{DOMAIN}_car_entered"
+EVENT_CAR_EXITED = f"{DOMAIN}_car_exited"
+
+# API endpoint behind each data source (circuit breaker key)
+SOURCE_ENDPOINTS = {
+    SOURCE_FEE: "/fee/detail",
+    SOURCE_RESERVE: "/pc/reserves",
+    SOURCE_CARS: "/pc/monthly-access-history",
+}
+
+# Fee data changes monthly; poll it far less often than parking data
+FEE_UPDATE_INTERVAL = timedelta(hours=6)
+# Accounts without fee data (404) are re-checked after this long
+FEE_NEGATIVE_TTL = timedelta(hours=24)
+# Start polling for the next bill this many days before last month's posting day
+FEE_POSTING_LEAD_DAYS = 3
+MIN_UPDATE_INTERVAL = timedelta(seconds=30)
+
+# Adaptive car status polling
+ADAPTIVE_FAST_INTERVAL = timedelta(minutes=1)
+ADAPTIVE_FAST_WINDOW = timedelta(minutes=15)
+ADAPTIVE_IDLE_AFTER = timedelta(hours=2)
+ADAPTIVE_MAX_INTERVAL = timedelta(hours=1)
 
 BASE_URL = "https://v2.aptner.com"
+# Global cap on concurrent connections to BASE_URL (all accounts)
+MAX_CONCURRENT_CONNECTIONS = 4
+# Per-request timeout (seconds)
+REQUEST_TIMEOUT = 15
+
+# Refresh the access token this many seconds before it expires, but never
+# earlier than this fraction of its remaining lifetime
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_REFRESH_MAX_FRACTION = 0.25
+# Minimum delay (seconds) before a proactive token refresh
+TOKEN_REFRESH_MIN_DELAY = 60
+
+# Access history is reduced per car as reports are read
+ACCESS_HISTORY_PATH = "/pc/monthly-access-history"
+ACCESS_REPORT_KEY = "visitCarUseHistoryReportList"
+STREAM_CHUNK_SIZE = 64 * 1024
+# Responses up to this size are parsed whole (orjson is several times faster);
+# only larger ones go through the streaming parser to bound memory
+STREAM_MIN_SIZE = 4 * 1024 * 1024
+# Parking events older than this are dropped from the per-car index
+DEFAULT_EVENT_RETENTION = timedelta(days=35)
+# Reports this far behind the newest merged event are re-checked (deduplicated)
+# on every merge, so late or out-of-order reports aren't lost
+EVENT_MERGE_OVERLAP = timedelta(days=1)
+
+# Max concurrent /pc/reserves page requests
+DEFAULT_PAGE_CONCURRENCY = 4
+# Safety cap when the API doesn't return totalPages
+MAX_RESERVE_PAGES = 20
+# Max concurrent reservation posts from the reserve_cars service
+BULK_RESERVE_CONCURRENCY = 3
+DEFAULT_RESERVE_PURPOSE = "지인/가족방문"
+# Longest visit (days) one reservation may cover; the same limit as the
+# reserve_car days selector in services.yaml
+MAX_RESERVE_DAYS = 30
+# Seconds to wait after the last reservation before re-syncing with the API
+RESERVE_RECONCILE_COOLDOWN = 30
+
+PLATFORMS = ["sensor", "device_tracker", "calendar"]
 
-PLATFORMS = ["sensor", "device_tracker"]
+# Response cache TTLs (seconds) per API path (query string excluded)
+CACHE_TTLS: dict[str, float] = {
+    "/fee/detail": 300,
+    "/pc/monthly-access-history": 30,
+    "/pc/reserves": 30,
+}
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Any, Awaitable, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .analytics import ParkingAnalytics
+from .api import AptnerClient, AptnerError, AptnerNotFoundError
+from .const import (
+    CACHE_TTLS,
+    CONF_ACTIVE_HOURS,
+    CONF_CARS,
+    CONF_REQUEST_BUDGET,
+    CONF_SCAN_INTERVAL_MIN,
+    DEFAULT_ACTIVE_HOURS,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DOMAIN,
+    EVENT_CAR_ENTERED,
+    EVENT_CAR_EXITED,
+    FEE_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    RESERVE_RECONCILE_COOLDOWN,
+    SOURCE_CARS,
+    SOURCE_ENDPOINTS,
+    SOURCE_FEE,
+    SOURCE_METRICS,
+    SOURCE_RESERVE,
+)
+from .models import (
+    AccessEvent,
+    CarStatus,
+    Fee,
+    ReserveRange,
+    format_aptner_datetime,
+    reserve_ranges_as_dict,
+    reserve_ranges_from_dict,
+)
+from .reserve_sync import AptnerReserveSync
+from .scheduler import AdaptivePollScheduler, parse_active_hours
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+ANALYTICS_SAVE_DELAY = 30
+
+def snapshot_store(hass: HomeAssistant, entry_id: str, kind: str) -> Store[dict[str, Any]]:
+    """Return the Store holding a coordinator's last good data."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot_{kind}")
+
+def entry_option(entry: ConfigEntry, key: str, default: Any) -> Any:
+    """Return an option, falling back to entry data (기존 동작과 동일)."""
+    if entry.options:
+        return entry.options.get(key, default)
+    return entry.data.get(key, default)
+
+def snapshot_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Return coordinator data in its JSON storage form."""
+    out: dict[str, Any] = {}
+    if SOURCE_FEE in data:
+        fee: Fee | None = data[SOURCE_FEE]
+        out[SOURCE_FEE] = fee.as_dict() if fee is not None else None
+    if SOURCE_RESERVE in data:
+        out[SOURCE_RESERVE] = reserve_ranges_as_dict(data[SOURCE_RESERVE])
+    if SOURCE_CARS in data:
+        out[SOURCE_CARS] = {carno: status.as_dict() for carno, status in data[SOURCE_CARS].items()}
+    return out
+
+def restore_data(stored: dict[str, Any], tz: tzinfo | None) -> dict[str, Any]:
+    """Parse snapshot_data() output back into models."""
+    data: dict[str, Any] = {}
+    if SOURCE_FEE in stored:
+        # 이전 버전은 관리비 정보가 없으면 {}를 저장
+        data[SOURCE_FEE] = Fee.from_dict(stored[SOURCE_FEE]) if stored[SOURCE_FEE] else None
+    if SOURCE_RESERVE in stored:
+        data[SOURCE_RESERVE] = reserve_ranges_from_dict(stored[SOURCE_RESERVE])
+    if SOURCE_CARS in stored:
+        data[SOURCE_CARS] = {
+            carno: CarStatus.from_dict(status, tz) for carno, status in stored[SOURCE_CARS].items()
+        }
+    return data
+
+class AptnerDataCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """One coordinator per entry for fee, reserve and car status data.
+
+    Each source has its own cadence; due sources are fetched in one
+    concurrent batch and only listeners whose source (their coordinator
+    context) changed are notified. A failing source only makes its own
+    entities unavailable; the coordinator update fails when no source has
+    usable data. Car trackers listen per car
+    ((SOURCE_CARS, carno)), and every new entry/exit of a tracked car in
+    the parking event index fires an in/out event, in time order.
+    New parking events of the configured cars feed the long-term parking
+    statistics. Reservations made through the services are merged into
+    the reserve data right away and checked against the API by one
+    debounced refresh. The last good data is kept on disk, so entities are
+    restored immediately on startup and the first network refresh runs in
+    the background.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: AptnerClient,
+        reserve_sync: AptnerReserveSync,
+    ) -> None:
+        scan_interval = timedelta(
+            minutes=int(entry_option(entry, CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN))
+        )
+        super().__init__(
+            hass,
+            logger=_LOGGER,
+            name=f"{DOMAIN}_{entry.entry_id}",
+            update_interval=scan_interval,
+        )
+        self.client = client
+        self.reserve_sync = reserve_sync
+        self.cars: list[str] = [c for c in entry_option(entry, CONF_CARS, []) or [] if c]
+        try:
+            active_hours = parse_active_hours(
+                entry_option(entry, CONF_ACTIVE_HOURS, DEFAULT_ACTIVE_HOURS)
+            )
+        except ValueError as err:
+            _LOGGER.warning("Ignoring invalid active hours: %s", err)
+            active_hours = []
+        self.scheduler = AdaptivePollScheduler(scan_interval, active_hours=active_hours)
+        self._request_budget = int(
+            entry_option(entry, CONF_REQUEST_BUDGET, DEFAULT_REQUEST_BUDGET)
+        )
+        self.data = {}
+        self._entry = entry
+        self._store = snapshot_store(hass, entry.entry_id, "data")
+        self.analytics = ParkingAnalytics(dt_util.DEFAULT_TIME_ZONE)
+        self._analytics_store = snapshot_store(hass, entry.entry_id, "analytics")
+        self._scan_interval = scan_interval
+        self._cadence: dict[str, timedelta] = {
+            SOURCE_FEE: max(FEE_UPDATE_INTERVAL, scan_interval),
+            SOURCE_RESERVE: scan_interval,
+            SOURCE_CARS: scan_interval,
+        }
+        self._fetchers: dict[str, Callable[[], Awaitable[Any]]] = {
+            SOURCE_FEE: self._async_fetch_fee,
+            SOURCE_RESERVE: self._async_fetch_reserve,
+            SOURCE_CARS: self._async_fetch_cars,
+        }
+        # Epoch seconds: last successful fetch and next scheduled fetch per source
+        self.fetched_at: dict[str, float] = {}
+        self._next_due: dict[str, float] = {}
+        # Sources whose last fetch failed, with the error
+        self.failed_sources: dict[str, str] = {}
+        self._changed: set[str] | None = None
+        # Event index watermark up to which in/out events have been fired
+        self._events_mark: float | None = None
+        # Entity state writes done / skipped as unchanged (see AptnerEntity)
+        self.state_writes = 0
+        self.state_writes_skipped = 0
+        self._shared_refresh: asyncio.Task | None = None
+        # 예약 갱신, 서비스 갱신, 재확인이 겹쳐도 한 번에 하나씩 실행
+        self._refresh_lock = asyncio.Lock()
+        # 연속 예약 시 API 확인은 한 번만
+        self._reserve_reconciler = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=RESERVE_RECONCILE_COOLDOWN,
+            immediate=False,
+            function=self._async_reconcile_reserve,
+        )
+
+    @property
+    def breaker_states(self) -> dict[str, str]:
+        """Return the circuit breaker state behind each data source."""
+        return {
+            source: self.client.breaker(endpoint).state
+            for source, endpoint in SOURCE_ENDPOINTS.items()
+        }
+
+    def source_available(self, context: Any) -> bool:
+        """Return False if the source behind a listener context last failed."""
+        source = context[0] if isinstance(context, tuple) else context
+        return source not in self.failed_sources
+
+    def _source_contexts(self, source: str) -> set[Any]:
+        """Return the listener contexts fed by a source."""
+        if source == SOURCE_CARS:
+            return {SOURCE_CARS, *((SOURCE_CARS, carno) for carno in self.cars)}
+        return {source}
+
+    async def async_restore(self) -> bool:
+        """Load the on-disk snapshot into self.data."""
+        if analytics := await self._analytics_store.async_load():
+            self.analytics.load(analytics)
+        stored = await self._store.async_load()
+        if not stored or "data" not in stored:
+            return False
+        try:
+            self.data = restore_data(stored["data"], dt_util.DEFAULT_TIME_ZONE)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("%s: ignoring unreadable snapshot: %s", self.name, err)
+            return False
+        self.fetched_at = stored.get("fetched_at", {})
+        self._next_due = stored.get("next_due", {})
+        self.scheduler.last_change = stored.get("last_change")
+        self._events_mark = stored.get("events_mark")
+        _LOGGER.debug("%s: restored snapshot", self.name)
+        return True
+
+    def async_start_background_refresh(self) -> None:
+        """Run the first refresh without blocking entry setup."""
+        self._entry.async_create_background_task(
+            self.hass, self.async_refresh(), f"{self.name} first refresh"
+        )
+
+    async def async_get_source(self, source: str, max_age: float) -> Any:
+        """Return a source's data, refreshed first if older than max_age seconds.
+
+        Concurrent callers share one coordinator refresh.
+        """
+        requested = time.time()
+        if requested - self.fetched_at.get(source, 0) > max_age:
+            endpoint = SOURCE_ENDPOINTS[source]
+            if max_age < CACHE_TTLS.get(endpoint, 0):
+                # 클라이언트 응답 캐시가 max_age보다 오래됐을 수 있음
+                self.client.invalidate_cache(endpoint)
+            if source == SOURCE_FEE:
+                # 고지 주기 캐시는 다음 고지 전까지 API를 조회하지 않으므로 건너뜀
+                self.client.fee_cache.expire()
+            for _ in range(2):
+                self._next_due[source] = 0
+                if await self._async_shared_refresh():
+                    break
+                # 이미 진행 중이던 갱신에 합류했다면 이 소스가 빠졌을 수 있음
+                if self.fetched_at.get(source, 0) >= requested:
+                    break
+            if self.fetched_at.get(source, 0) < requested:
+                raise AptnerError(f"Failed to refresh {source}")
+        return (self.data or {}).get(source)
+
+    async def _async_shared_refresh(self) -> bool:
+        """Join the running service-triggered refresh or start one; True if started."""
+        task = self._shared_refresh
+        started = task is None or task.done()
+        if started:
+            task = self._shared_refresh = self.hass.async_create_task(
+                self.async_refresh(), f"{self.name} service refresh"
+            )
+        await asyncio.shield(task)
+        return started
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending reservation check and shut down."""
+        self._reserve_reconciler.async_shutdown()
+        await super().async_shutdown()
+
+    @callback
+    def async_apply_reservation(self, carno: str, start: date, days: int) -> None:
+        """Merge a successful reservation into the reserve data (write-through)."""
+        self.reserve_sync.apply_reservation(carno, start, days)
+        upcoming = self.reserve_sync.index.car_ranges(carno, date.today())
+        if not upcoming:
+            return
+        data = dict(self.data or {})
+        reserves = dict(data.get(SOURCE_RESERVE) or {})
+        reserves[carno] = upcoming
+        data[SOURCE_RESERVE] = reserves
+        self.data = data
+        self._changed = {SOURCE_RESERVE}
+        self.async_update_listeners()
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        self._reserve_reconciler.async_schedule_call()
+
+    async def _async_reconcile_reserve(self) -> None:
+        """Re-sync reserves now (other sources keep their schedule)."""
+        self._next_due[SOURCE_RESERVE] = 0
+        await self.async_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners whose source changed (all of them if unknown)."""
+        changed, self._changed = self._changed, None
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context in changed:
+                update_callback()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        # 동시에 실행되면 같은 소스를 중복 조회하고 서로의 결과를 덮어씀
+        async with self._refresh_lock:
+            return await self._async_update_sources()
+
+    async def _async_update_sources(self) -> dict[str, Any]:
+        now = time.time()
+        # 스케줄 지터를 흡수하기 위해 약간의 여유를 둠
+        due: list[str] = []
+        for source in self._fetchers:
+            if self._next_due.get(source, 0) > now + MIN_UPDATE_INTERVAL.total_seconds() / 2:
+                continue
+            retry_in = self.client.breaker(SOURCE_ENDPOINTS[source]).retry_in()
+            if retry_in > 0:
+                # 차단기가 열려 있으면 요청하지 않고 반개방 시점에 다시 시도
+                _LOGGER.debug("%s: %s circuit open, skipping", self.name, source)
+                self._next_due[source] = now + retry_in
+                continue
+            due.append(source)
+        results = await asyncio.gather(
+            *(self._fetchers[source]() for source in due), return_exceptions=True
+        )
+
+        data = dict(self.data or {})
+        changed: set[Any] = set()
+        errors: dict[str, BaseException] = {}
+        now = time.time()
+        for source, result in zip(due, results):
+            if isinstance(result, BaseException):
+                errors[source] = result
+                _LOGGER.warning("%s: failed to fetch %s: %s", self.name, source, result)
+                if source not in self.failed_sources:
+                    # 이 소스의 엔티티만 unavailable로 전환
+                    changed.update(self._source_contexts(source))
+                self.failed_sources[source] = str(result)
+                self._next_due[source] = now + min(
+                    self._cadence[source], self._scan_interval
+                ).total_seconds()
+                continue
+            self.fetched_at[source] = now
+            if self.failed_sources.pop(source, None) is not None:
+                changed.update(self._source_contexts(source))
+            old = data.get(source)
+            source_changed = old != result
+            if source_changed:
+                data[source] = result
+                changed.add(source)
+            if source == SOURCE_CARS:
+                if source_changed:
+                    changed.update(self._diff_cars(old, result))
+                self._fire_car_events()
+                self._update_analytics()
+                interval = self._next_car_interval(source_changed, now)
+            else:
+                interval = self._cadence[source]
+            self._next_due[source] = now + interval.total_seconds()
+
+        if due:
+            changed.add(SOURCE_METRICS)
+        self.update_interval = self._time_until_next_due()
+        if errors and self.failed_sources.keys() >= self._fetchers.keys():
+            # 모든 소스가 실패한 상태일 때만 전체 갱신 실패
+            raise UpdateFailed(
+                "Error fetching " + ", ".join(f"{s}: {e}" for s, e in errors.items())
+            )
+
+        # 이전 갱신이 실패했다면 가용성 복구를 위해 모든 엔티티에 알림
+        self._changed = changed if self.last_update_success else None
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        return data
+
+    def _diff_cars(
+        self, old: dict[str, CarStatus] | None, new: dict[str, CarStatus]
+    ) -> set[tuple[str, str]]:
+        """Return tracker contexts of cars whose status changed."""
+        return {
+            (SOURCE_CARS, carno)
+            for carno in set(new) | set(old or {})
+            if (old or {}).get(carno) != new.get(carno)
+        }
+
+    def _fire_car_events(self) -> None:
+        """Fire an in/out event for each indexed event since the last poll.
+
+        Comparing two status snapshots would miss a car that entered and
+        left (or left and came back) between polls. Nothing is fired on the
+        very first poll, so an install doesn't report every car as just
+        entered.
+        """
+        index = self.client.events
+        mark, self._events_mark = self._events_mark, index.watermark
+        if mark is None:
+            return
+        events = sorted(
+            (event for carno in self.cars for event in index.events_after(carno, mark)),
+            key=lambda event: (event.time, not event.entered),
+        )
+        for event in events:
+            self._fire_car_event(event)
+
+    def _fire_car_event(self, event: AccessEvent) -> None:
+        if event.entered:
+            in_datetime, out_datetime = event.time, None
+        else:
+            entered = self.client.events.entry_before(event.carno, event.time.timestamp())
+            in_datetime = (
+                datetime.fromtimestamp(entered, event.time.tzinfo) if entered is not None else None
+            )
+            out_datetime = event.time
+        self.hass.bus.async_fire(
+            EVENT_CAR_ENTERED if event.entered else EVENT_CAR_EXITED,
+            {
+                "entry_id": self._entry.entry_id,
+                "car_number": event.carno,
+                "timestamp": format_aptner_datetime(event.time),
+                "in_datetime": format_aptner_datetime(in_datetime),
+                "out_datetime": format_aptner_datetime(out_datetime),
+            },
+        )
+
+    def _update_analytics(self) -> None:
+        """Count new parking events and import the days they touched."""
+        touched = self.analytics.update(
+            self.client.events.cars, self.cars, dt_util.now().date()
+        )
+        if not touched:
+            return
+        if "recorder" in self.hass.config.components:
+            self.analytics.async_import(self.hass, touched)
+        self._analytics_store.async_delay_save(self.analytics.as_dict, ANALYTICS_SAVE_DELAY)
+
+    def _next_car_interval(self, changed: bool, now: float) -> timedelta:
+        """Return the adaptive car status interval after a successful poll."""
+        self.scheduler.record(changed, now)
+        return self.scheduler.next_interval(
+            now, dt_util.now(), self.client.budget_wait(self._request_budget)
+        )
+
+    def _time_until_next_due(self) -> timedelta:
+        now = time.time()
+        seconds = min(self._next_due.get(source, now) - now for source in self._fetchers)
+        return max(MIN_UPDATE_INTERVAL, timedelta(seconds=seconds))
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "data": snapshot_data(self.data),
+            "fetched_at": self.fetched_at,
+            "next_due": self._next_due,
+            "last_change": self.scheduler.last_change,
+            "events_mark": self._events_mark,
+        }
+
+    async def _async_fetch_fee(self) -> Fee | None:
+        try:
+            return await self.client.get_fee()
+        except AptnerNotFoundError:
+            # 404 에러는 관리비 정보가 없는 경우로 간주
+            _LOGGER.debug("No fee information available for this account")
+            return None
+
+    async def _async_fetch_reserve(self) -> dict[str, list[ReserveRange]]:
+        return await self.reserve_sync.async_sync()
+
+    async def _async_fetch_cars(self) -> dict[str, CarStatus]:
+        if not self.cars:
+            return {}
+        # 여러 차량의 상태를 한 번에 가져오기 위해 carno=None 사용
+        all_cars_data = await self.client.get_car_status(carno=None)
+        return {
+            carno: all_cars_data.get(carno) or CarStatus.not_found(carno)
+            for carno in self.cars
+        }
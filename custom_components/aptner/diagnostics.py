@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CARS, CONF_ID, CONF_PASSWORD, DOMAIN
+from .coordinator import AptnerDataCoordinator
+
+# 계정 정보와 차량번호
+TO_REDACT = {CONF_ID, CONF_PASSWORD, CONF_CARS}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: AptnerDataCoordinator = data["coordinator"]
+    client = coordinator.client
+    scheduler = coordinator.scheduler
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "api": {
+            "endpoints": client.metrics.as_dict(),
+            "cache": client.cache_stats,
+            "breakers": client.breaker_states,
+            "requests_last_hour": client.requests_last_hour,
+            "fee_cache": client.fee_cache.as_dict(),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "fetched_at": coordinator.fetched_at,
+            "failed_sources": coordinator.failed_sources,
+            "car_poll_interval": scheduler.current_interval.total_seconds(),
+            "car_poll_target_interval": scheduler.target_interval.total_seconds(),
+            "state_writes": coordinator.state_writes,
+            "state_writes_skipped": coordinator.state_writes_skipped,
+        },
+        "reserve_sync": {
+            "pages_parsed": coordinator.reserve_sync.pages_parsed,
+            "pages_skipped": coordinator.reserve_sync.pages_skipped,
+            "indexed_cars": len(coordinator.reserve_sync.index),
+        },
+    }
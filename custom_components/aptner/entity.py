@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import AptnerDataCoordinator
+
+def entry_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return device info of the account (shared by its entities)."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name="Aptner",
+        manufacturer="Aptner",
+        model="v2 API",
+    )
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable, order-independent copy of a state value."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+class AptnerEntity(CoordinatorEntity[AptnerDataCoordinator]):
+    """Coordinator entity that only writes state when it actually changed.
+
+    The availability, state and attributes are hashed after each
+    coordinator update; an identical fingerprint skips the state write and
+    is counted on the coordinator (state_writes / state_writes_skipped).
+    """
+
+    _state_fingerprint: int | None = None
+
+    @property
+    def has_data(self) -> bool:
+        """Return True once the data this entity shows has been fetched."""
+        return True
+
+    @property
+    def available(self) -> bool:
+        """Unavailable until its data is first fetched, or while its source fails.
+
+        Setup doesn't wait for the first fetch, and another source failing
+        doesn't affect this entity.
+        """
+        return (
+            super().available
+            and self.coordinator.source_available(self.coordinator_context)
+            and self.has_data
+        )
+
+    def _fingerprint(self) -> int:
+        available = self.available
+        if not available:
+            return hash((False,))
+        return hash(
+            (
+                True,
+                self.state,
+                _freeze(self.state_attributes),
+                _freeze(self.extra_state_attributes),
+            )
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state and remember its fingerprint (also for non-coordinator writes)."""
+        self._state_fingerprint = self._fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the fingerprint changed."""
+        fingerprint = self._fingerprint()
+        if fingerprint == self._state_fingerprint:
+            self.coordinator.state_writes_skipped += 1
+            return
+        self._state_fingerprint = fingerprint
+        self.coordinator.state_writes += 1
+        super().async_write_ha_state()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import base64
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, tzinfo
+from typing import Any, Iterable
+
+from .const import EVENT_MERGE_OVERLAP
+from .models import AccessEvent, CarStatus, format_aptner_datetime, parse_aptner_datetime
+
+FLAG_OUT = 0
+FLAG_IN = 1
+
+class CarEvents:
+    """Array-backed in/out event log of one car, with O(1) latest lookups."""
+
+    __slots__ = ("times", "flags", "last_in", "last_out", "last_in_raw", "last_out_raw")
+
+    def __init__(self) -> None:
+        self.times = array("d")
+        self.flags = array("b")
+        self.last_in: float | None = None
+        self.last_out: float | None = None
+        self.last_in_raw: str | None = None
+        self.last_out_raw: str | None = None
+
+    @property
+    def is_exit(self) -> bool:
+        """Return True if the car's latest event is an exit (or unknown)."""
+        if self.last_in is None:
+            return True
+        return self.last_out is not None and self.last_out >= self.last_in
+
+    def insert(self, ts: float, flag: int, raw: str) -> bool:
+        """Insert an event in time order; return False if it is already stored."""
+        lo = bisect_left(self.times, ts)
+        hi = bisect_right(self.times, ts, lo)
+        if flag in self.flags[lo:hi] or ts == (self.last_in if flag == FLAG_IN else self.last_out):
+            return False
+        # 같은 시각이면 입차를 출차보다 먼저
+        idx = lo if flag == FLAG_IN else hi
+        self.times.insert(idx, ts)
+        self.flags.insert(idx, flag)
+        if flag == FLAG_IN:
+            if self.last_in is None or ts > self.last_in:
+                self.last_in, self.last_in_raw = ts, raw
+        elif self.last_out is None or ts > self.last_out:
+            self.last_out, self.last_out_raw = ts, raw
+        return True
+
+    def prune(self, cutoff: float) -> None:
+        """Drop events older than cutoff (latest in/out are kept)."""
+        idx = bisect_left(self.times, cutoff)
+        if idx:
+            del self.times[:idx]
+            del self.flags[:idx]
+
+    def status(self, carno: str, tz: tzinfo | None) -> CarStatus:
+        """Return the car's latest status."""
+        return CarStatus.from_times(carno, self.last_in, self.last_out, tz)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "t": base64.b64encode(self.times.tobytes()).decode("ascii"),
+            "f": base64.b64encode(self.flags.tobytes()).decode("ascii"),
+            "in": [self.last_in, self.last_in_raw],
+            "out": [self.last_out, self.last_out_raw],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CarEvents:
+        events = cls()
+        events.times.frombytes(base64.b64decode(data["t"]))
+        events.flags.frombytes(base64.b64decode(data["f"]))
+        events.last_in, events.last_in_raw = data["in"]
+        events.last_out, events.last_out_raw = data["out"]
+        return events
+
+def _sortable(raw: str) -> str:
+    """Return a report timestamp in a form that sorts like "%Y-%m-%d %H:%M:%S"."""
+    return raw.replace(".", "-").replace("T", " ")
+
+class EventBatch:
+    """New events of one merge, reduced per car to (time, flag, raw) tuples.
+
+    Reports are added one at a time as they are streamed. Timestamps before
+    the floor (the index watermark minus its overlap window) are skipped
+    with a string comparison, without parsing.
+    """
+
+    __slots__ = ("tz", "_floor", "_floor_raw", "events")
+
+    def __init__(self, floor: float, tz: tzinfo | None) -> None:
+        self.tz = tz
+        self._floor = floor
+        self._floor_raw = (
+            datetime.fromtimestamp(floor, tz).strftime("%Y-%m-%d %H:%M:%S") if floor > 0 else ""
+        )
+        self.events: dict[str, list[tuple[float, int, str]]] = {}
+
+    def add(self, report: dict[str, Any]) -> None:
+        """Add the entry/exit of one access report."""
+        cno = report.get("carNo")
+        if not cno:
+            return
+        for key, flag in (("inDatetime", FLAG_IN), ("outDatetime", FLAG_OUT)):
+            raw = report.get(key)
+            if not raw or _sortable(raw) < self._floor_raw:
+                continue
+            ts = parse_aptner_datetime(raw, self.tz)
+            if ts is None or ts < self._floor:
+                continue
+            self.events.setdefault(cno, []).append((ts, flag, raw))
+
+class ParkingEventIndex:
+    """Per-car parking event index, merged incrementally from access reports.
+
+    Reports older than the newest merged event minus an overlap window are
+    skipped with a string comparison. Newer ones are deduplicated per
+    (car, time, in/out), so reports that show up late or out of order
+    within the window are still indexed. Events older than the retention
+    window are pruned.
+    """
+
+    def __init__(
+        self,
+        retention: float,
+        tz: tzinfo | None = None,
+        overlap: float = EVENT_MERGE_OVERLAP.total_seconds(),
+    ) -> None:
+        self.retention = retention
+        self.tz = tz
+        self.overlap = overlap
+        self.cars: dict[str, CarEvents] = {}
+        # Newest merged event (epoch seconds)
+        self.watermark = 0.0
+
+    def batch(self) -> EventBatch:
+        """Return an empty batch for the next merge."""
+        floor = self.watermark - self.overlap if self.watermark else 0.0
+        return EventBatch(floor, self.tz)
+
+    def commit(self, batch: EventBatch, now: float) -> set[str]:
+        """Merge a batch; return the cars whose events changed."""
+        changed: set[str] = set()
+        for cno, events in batch.events.items():
+            car = self.cars.get(cno)
+            if car is None:
+                car = self.cars[cno] = CarEvents()
+            for ts, flag, raw in sorted(events, key=lambda e: (e[0], -e[1])):
+                if car.insert(ts, flag, raw):
+                    changed.add(cno)
+                    self.watermark = max(self.watermark, ts)
+        self.prune(now)
+        return changed
+
+    def merge(self, reports: Iterable[dict[str, Any]], now: float) -> set[str]:
+        """Merge access reports; return the cars whose events changed."""
+        batch = self.batch()
+        for report in reports:
+            batch.add(report)
+        return self.commit(batch, now)
+
+    def prune(self, now: float) -> None:
+        """Apply the retention window.
+
+        A car is forgotten only once it has left and its last event is
+        older than the window; a car still parked keeps its latest entry.
+        """
+        cutoff = now - self.retention
+        for cno in list(self.cars):
+            car = self.cars[cno]
+            car.prune(cutoff)
+            if (
+                not car.times
+                and car.is_exit
+                and max(car.last_in or 0, car.last_out or 0) < cutoff
+            ):
+                del self.cars[cno]
+
+    def status(self, carno: str) -> CarStatus | None:
+        """Return a car's latest status, or None if unknown."""
+        car = self.cars.get(carno)
+        return car.status(carno, self.tz) if car is not None else None
+
+    def events_after(self, carno: str, after: float) -> list[AccessEvent]:
+        """Return a car's events newer than `after` (epoch seconds), oldest first.
+
+        Only the latest entry and exit keep their report string; for older
+        events `raw` is the formatted time.
+        """
+        car = self.cars.get(carno)
+        if car is None:
+            return []
+        events: list[AccessEvent] = []
+        for idx in range(bisect_right(car.times, after), len(car.times)):
+            ts = car.times[idx]
+            entered = car.flags[idx] == FLAG_IN
+            time = datetime.fromtimestamp(ts, self.tz)
+            if ts == (car.last_in if entered else car.last_out):
+                raw = car.last_in_raw if entered else car.last_out_raw
+            else:
+                raw = format_aptner_datetime(time)
+            events.append(AccessEvent(carno, time, entered, raw))
+        return events
+
+    def entry_before(self, carno: str, ts: float) -> float | None:
+        """Return the entry that opened the visit an exit at `ts` closes, if known."""
+        car = self.cars.get(carno)
+        if car is None:
+            return None
+        idx = bisect_left(car.times, ts)
+        if idx:
+            return car.times[idx - 1] if car.flags[idx - 1] == FLAG_IN else None
+        # 입차 기록이 보존 기간 밖으로 정리된 경우
+        return car.last_in if car.last_in is not None and car.last_in < ts else None
+
+    def last_entry(self, carno: str) -> float | None:
+        """Return the car's last entry time (epoch seconds)."""
+        car = self.cars.get(carno)
+        return car.last_in if car is not None else None
+
+    def last_exit(self, carno: str) -> float | None:
+        """Return the car's last exit time (epoch seconds)."""
+        car = self.cars.get(carno)
+        return car.last_out if car is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form for storage."""
+        return {
+            "watermark": self.watermark,
+            "cars": {cno: car.as_dict() for cno, car in self.cars.items()},
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore from as_dict() output."""
+        watermark = data["watermark"]
+        # 이전 형식: [epoch, 원본 문자열]
+        self.watermark = watermark[0] if isinstance(watermark, list) else watermark
+        self.cars = {cno: CarEvents.from_dict(car) for cno, car in data["cars"].items()}
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, FEE_NEGATIVE_TTL, FEE_POSTING_LEAD_DAYS
+from .models import Fee
+from .token_store import account_key
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+def _month_start(value: datetime, months_ahead: int) -> datetime:
+    """Return midnight on the 1st of the month `months_ahead` after value."""
+    month_index = value.year * 12 + value.month - 1 + months_ahead
+    return value.replace(
+        year=month_index // 12,
+        month=month_index % 12 + 1,
+        day=1,
+        hour=0,
+        minute=0,
+        second=0,
+        microsecond=0,
+    )
+
+class FeeCache:
+    """Billing-cycle-aware cache of one account's fee, persisted across restarts.
+
+    A bill (year/month) is posted once a month, so once one is cached the
+    API isn't queried again until the next bill's posting window: the
+    following month, a few days before the day of month the current bill
+    first appeared (the 1st until a bill change has been observed).
+    Accounts without fee data (404) are negatively cached for
+    FEE_NEGATIVE_TTL. expire() forces the next lookup to the API, for
+    callers asking for data newer than a max_age.
+    """
+
+    def __init__(self, hass: HomeAssistant, user_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.fee_{account_key(user_id)}", private=True
+        )
+        self.fee: Fee | None = None
+        self.missing = False
+        # Epoch seconds: last API check, and when the cached bill first appeared
+        self.checked = 0.0
+        self.first_seen = 0.0
+        # Day of month a new bill was last seen to appear
+        self.posted_day: int | None = None
+        # Set by expire(): the cached answer isn't served until re-fetched
+        self._expired = False
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.fee = Fee.from_dict(stored["fee"]) if stored.get("fee") else None
+        self.missing = stored.get("missing", False)
+        self.checked = stored.get("checked", 0.0)
+        self.first_seen = stored.get("first_seen", 0.0)
+        self.posted_day = stored.get("posted_day")
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def next_check(self) -> float:
+        """Return when the API should be queried next (epoch seconds)."""
+        if self.missing:
+            return self.checked + FEE_NEGATIVE_TTL.total_seconds()
+        if self.fee is None:
+            return 0.0
+        seen = dt_util.as_local(dt_util.utc_from_timestamp(self.first_seen))
+        window = _month_start(seen, 1)
+        if self.posted_day is not None:
+            # 지난 고지일 며칠 전부터 조회 재개
+            day = max(1, self.posted_day - FEE_POSTING_LEAD_DAYS)
+            window += timedelta(days=day - 1)
+        return window.timestamp()
+
+    def is_fresh(self, now: float) -> bool:
+        """Return True if the cached answer (bill or no data) can be served."""
+        return (
+            not self._expired
+            and (self.fee is not None or self.missing)
+            and now < self.next_check()
+        )
+
+    def expire(self) -> None:
+        """Make the next lookup query the API (the billing cycle is kept)."""
+        self._expired = True
+
+    def set_fee(self, fee: Fee, now: float) -> None:
+        """Record a fetched bill; a new year/month starts a new cycle."""
+        if self.fee is None or (fee.year, fee.month) != (self.fee.year, self.fee.month):
+            if self.fee is not None:
+                self.posted_day = dt_util.as_local(dt_util.utc_from_timestamp(now)).day
+            self.first_seen = now
+        self.fee = fee
+        self.missing = False
+        self.checked = now
+        self._expired = False
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def set_missing(self, now: float) -> None:
+        """Record that the account has no fee data."""
+        self.fee = None
+        self.missing = True
+        self.checked = now
+        self._expired = False
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "missing": self.missing,
+            "bill": [self.fee.year, self.fee.month] if self.fee else None,
+            "checked": self.checked,
+            "next_check": self.next_check(),
+            "posted_day": self.posted_day,
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "fee": self.fee.as_dict() if self.fee else None,
+            "missing": self.missing,
+            "checked": self.checked,
+            "first_seen": self.first_seen,
+            "posted_day": self.posted_day,
+        }
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is +Inf
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class EndpointMetrics:
+    """Counters and latency histogram for one API endpoint."""
+
+    __slots__ = (
+        "requests",
+        "errors",
+        "retries",
+        "reauths",
+        "bytes_total",
+        "bytes_last",
+        "latency_total",
+        "latency_max",
+        "parse_time_total",
+        "histogram",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.reauths = 0
+        self.bytes_total = 0
+        self.bytes_last = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.parse_time_total = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, latency: float, size: int = 0, parse_time: float = 0.0, *, ok: bool = True) -> None:
+        """Record one HTTP round trip."""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.bytes_total += size
+        self.bytes_last = size
+        self.parse_time_total += parse_time
+
+    @property
+    def latency_avg(self) -> float | None:
+        """Return the mean latency in seconds."""
+        return self.latency_total / self.requests if self.requests else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        buckets = {f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.histogram)}
+        buckets["le_inf"] = self.histogram[-1]
+        avg = self.latency_avg
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "reauths": self.reauths,
+            "bytes_total": self.bytes_total,
+            "bytes_last": self.bytes_last,
+            "latency_avg_ms": round(avg * 1000, 1) if avg is not None else None,
+            "latency_max_ms": round(self.latency_max * 1000, 1),
+            "parse_time_ms": round(self.parse_time_total * 1000, 1),
+            "latency_histogram": buckets,
+        }
+
+class ApiMetrics:
+    """Per-endpoint API metrics of one client."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, path: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint (query string ignored)."""
+        endpoint = path.split("?", 1)[0]
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def total(self, attr: str) -> float:
+        """Return the sum of a counter over all endpoints."""
+        return sum(getattr(metrics, attr) for metrics in self.endpoints.values())
+
+    @property
+    def latency_avg(self) -> float | None:
+        """Return the mean latency over all endpoints, in seconds."""
+        requests = self.total("requests")
+        return self.total("latency_total") / requests if requests else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all endpoint metrics for diagnostics."""
+        return {endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()}
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, tzinfo
+from typing import Any
+
+# Timestamp formats seen in access reports (first match wins)
+DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y.%m.%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y.%m.%d %H:%M",
+)
+# Format used when a parsed datetime goes back into a response or attribute
+OUTPUT_DATETIME_FORMAT = DATETIME_FORMATS[0]
+
+def parse_aptner_datetime(value: str | None, tz: tzinfo | None = None) -> float | None:
+    """Parse an Aptner datetime string into epoch seconds (naive = tz)."""
+    if not value:
+        return None
+    try:
+        # ISO 형식(대부분의 응답)은 strptime보다 훨씬 빠름
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in DATETIME_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+            break
+        else:
+            return None
+    if parsed.tzinfo is None and tz is not None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed.timestamp()
+
+def _to_datetime(ts: float | None, tz: tzinfo | None) -> datetime | None:
+    return datetime.fromtimestamp(ts, tz) if ts is not None else None
+
+def format_aptner_datetime(value: datetime | None) -> str | None:
+    """Return a datetime in the Aptner response format (local wall time)."""
+    return value.strftime(OUTPUT_DATETIME_FORMAT) if value is not None else None
+
+@dataclass(slots=True)
+class Fee:
+    """One monthly bill."""
+
+    year: int | None
+    month: int | None
+    amount: int | None
+    details: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(cls, fee: dict[str, Any]) -> Fee:
+        """Parse the `fee` object of /fee/detail."""
+        return cls(
+            year=fee.get("year"),
+            month=fee.get("month"),
+            amount=fee.get("currentFee"),
+            details={item["name"]: item["value"] for item in fee.get("details") or []},
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Fee:
+        """Parse as_dict() output (service response / storage format)."""
+        return cls(
+            year=data.get("year"),
+            month=data.get("month"),
+            amount=data.get("fee"),
+            details=dict(data.get("details") or {}),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "year": self.year,
+            "month": self.month,
+            "fee": self.amount,
+            "details": dict(self.details),
+        }
+
+@dataclass(slots=True, frozen=True)
+class CarStatus:
+    """Latest parking status of one car."""
+
+    carno: str
+    is_exit: bool
+    in_datetime: datetime | None = None
+    out_datetime: datetime | None = None
+    found: bool = True
+
+    @classmethod
+    def not_found(cls, carno: str) -> CarStatus:
+        """Status used when the access history has no record of a car."""
+        return cls(carno, is_exit=True, found=False)  # 기본값 not_home
+
+    @classmethod
+    def from_times(
+        cls, carno: str, last_in: float | None, last_out: float | None, tz: tzinfo | None
+    ) -> CarStatus:
+        """Build from the latest entry/exit epoch seconds."""
+        is_exit = last_in is None or (last_out is not None and last_out >= last_in)
+        return cls(
+            carno,
+            is_exit=is_exit,
+            in_datetime=_to_datetime(last_in, tz),
+            out_datetime=_to_datetime(last_out, tz) if is_exit else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], tz: tzinfo | None) -> CarStatus:
+        """Parse as_dict() output (service response / storage format)."""
+        return cls(
+            data["carNo"],
+            is_exit=data.get("isExit") is not False,
+            in_datetime=_to_datetime(parse_aptner_datetime(data.get("inDatetime"), tz), tz),
+            out_datetime=_to_datetime(parse_aptner_datetime(data.get("outDatetime"), tz), tz),
+            found=data.get("status") != "not_found",
+        )
+
+    @property
+    def status(self) -> str:
+        if not self.found:
+            return "not_found"
+        return "out" if self.is_exit else "in"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "carNo": self.carno,
+            "isExit": self.is_exit,
+            "inDatetime": format_aptner_datetime(self.in_datetime),
+            "outDatetime": format_aptner_datetime(self.out_datetime),
+            "status": self.status,
+        }
+
+@dataclass(slots=True, frozen=True, order=True)
+class ReserveRange:
+    """Consecutive reserved dates of one car (end inclusive)."""
+
+    start: date
+    end: date
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> ReserveRange:
+        return cls(date.fromisoformat(data["from"]), date.fromisoformat(data["to"]))
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def dates(self) -> set[date]:
+        return {self.start + timedelta(days=offset) for offset in range(self.days)}
+
+    def as_dict(self) -> dict[str, str]:
+        return {"from": self.start.isoformat(), "to": self.end.isoformat()}
+
+@dataclass(slots=True, frozen=True)
+class AccessEvent:
+    """One parsed entry or exit from an access report."""
+
+    carno: str
+    time: datetime
+    entered: bool
+    raw: str
+
+    @classmethod
+    def parse(cls, carno: str, raw: str, entered: bool, tz: tzinfo | None) -> AccessEvent | None:
+        """Parse a report timestamp; None if it isn't a recognised datetime."""
+        ts = parse_aptner_datetime(raw, tz)
+        if ts is None:
+            return None
+        return cls(carno, datetime.fromtimestamp(ts, tz), entered, raw)
+
+def reserve_ranges_as_dict(data: dict[str, list[ReserveRange]] | None) -> dict[str, list[dict[str, str]]]:
+    """Return per-car ranges in get_reserve_status response format."""
+    return {car: [item.as_dict() for item in ranges] for car, ranges in (data or {}).items()}
+
+def reserve_ranges_from_dict(data: dict[str, list[dict[str, str]]] | None) -> dict[str, list[ReserveRange]]:
+    """Parse reserve_ranges_as_dict() output."""
+    return {
+        car: [ReserveRange.from_dict(item) for item in ranges] for car, ranges in (data or {}).items()
+    }
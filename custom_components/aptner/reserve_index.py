@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Iterable
+
+from .models import ReserveRange
+
+class ReservationIndex:
+    """Incrementally maintained merged reservation intervals.
+
+    Each car keeps its reserved days as sorted, disjoint, non-adjacent
+    intervals (parallel start/end ordinal lists). A global segment map keeps
+    the set of cars reserved from each boundary up to the next one. Both are
+    updated in place, one car at a time, and a date lookup is one bisect.
+    Range queries bisect each car's intervals.
+    """
+
+    __slots__ = ("_cars", "_bounds", "_active")
+
+    def __init__(self) -> None:
+        self._cars: dict[str, tuple[list[int], list[int]]] = {}
+        # 경계(ordinal)와, 그 경계부터 다음 경계 전날까지 예약된 차량
+        self._bounds: list[int] = []
+        self._active: list[frozenset[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._cars)
+
+    def add(self, carno: str, start: date, end: date) -> None:
+        """Merge the days [start, end] into a car's intervals."""
+        lo_day, hi_day = start.toordinal(), end.toordinal()
+        starts, ends = self._cars.setdefault(carno, ([], []))
+        # 겹치거나 맞닿은 구간을 하나로 합침
+        lo = bisect_left(ends, lo_day - 1)
+        hi = bisect_right(starts, hi_day + 1)
+        if lo < hi:
+            lo_day = min(lo_day, starts[lo])
+            hi_day = max(hi_day, ends[hi - 1])
+        starts[lo:hi] = [lo_day]
+        ends[lo:hi] = [hi_day]
+        self._mark(carno, lo_day, hi_day, True)
+
+    def set_car(self, carno: str, dates: Iterable[date]) -> None:
+        """Replace a car's reserved days."""
+        for lo_day, hi_day in zip(*self._cars.pop(carno, ((), ()))):
+            self._mark(carno, lo_day, hi_day, False)
+        days = sorted({day.toordinal() for day in dates})
+        if not days:
+            return
+        starts, ends = [days[0]], [days[0]]
+        for day in days[1:]:
+            if day == ends[-1] + 1:
+                ends[-1] = day
+            else:
+                starts.append(day)
+                ends.append(day)
+        self._cars[carno] = (starts, ends)
+        for lo_day, hi_day in zip(starts, ends):
+            self._mark(carno, lo_day, hi_day, True)
+
+    def prune(self, before: date) -> None:
+        """Drop days before `before` and coalesce equal global segments."""
+        cutoff = before.toordinal()
+        for carno in list(self._cars):
+            starts, ends = self._cars[carno]
+            idx = bisect_left(ends, cutoff)
+            del starts[:idx], ends[:idx]
+            if not starts:
+                del self._cars[carno]
+        idx = bisect_right(self._bounds, cutoff) - 1
+        bounds: list[int] = []
+        active: list[frozenset[str]] = []
+        for bound, cars in zip(self._bounds[max(idx, 0):], self._active[max(idx, 0):]):
+            if active and active[-1] == cars:
+                continue
+            bounds.append(bound)
+            active.append(cars)
+        self._bounds, self._active = bounds, active
+
+    def range_on(self, carno: str, day: date) -> ReserveRange | None:
+        """Return the reserved range of `carno` covering `day`, if any."""
+        starts, ends = self._cars.get(carno, ((), ()))
+        target = day.toordinal()
+        idx = bisect_right(starts, target) - 1
+        if idx < 0 or ends[idx] < target:
+            return None
+        return ReserveRange(date.fromordinal(starts[idx]), date.fromordinal(ends[idx]))
+
+    def cars_on(self, day: date) -> frozenset[str]:
+        """Return the cars reserved on `day`."""
+        idx = bisect_right(self._bounds, day.toordinal()) - 1
+        return self._active[idx] if idx >= 0 else frozenset()
+
+    def car_ranges(self, carno: str, since: date) -> list[ReserveRange]:
+        """Return a car's ranges from `since` on (a range in progress starts at since)."""
+        starts, ends = self._cars.get(carno, ((), ()))
+        cutoff = since.toordinal()
+        idx = bisect_left(ends, cutoff)
+        return [
+            ReserveRange(date.fromordinal(max(lo_day, cutoff)), date.fromordinal(hi_day))
+            for lo_day, hi_day in zip(starts[idx:], ends[idx:])
+        ]
+
+    def ranges(self, since: date) -> dict[str, list[ReserveRange]]:
+        """Return per-car ranges from `since` on (cars without any are left out)."""
+        out: dict[str, list[ReserveRange]] = {}
+        for carno in self._cars:
+            if ranges := self.car_ranges(carno, since):
+                out[carno] = ranges
+        return out
+
+    def overlapping(self, start: date, end: date) -> list[tuple[str, ReserveRange]]:
+        """Return (carno, range) of ranges intersecting [start, end], by start then car."""
+        lo_day, hi_day = start.toordinal(), end.toordinal()
+        found = [
+            (carno, ReserveRange(date.fromordinal(starts[idx]), date.fromordinal(ends[idx])))
+            for carno, (starts, ends) in self._cars.items()
+            for idx in range(bisect_left(ends, lo_day), bisect_right(starts, hi_day))
+        ]
+        found.sort(key=lambda item: (item[1].start, item[0]))
+        return found
+
+    def next_from(self, day: date) -> tuple[str, ReserveRange] | None:
+        """Return (carno, range) of the range in progress on `day`, or the next one."""
+        target = day.toordinal()
+        best: tuple[int, str, int] | None = None
+        for carno, (starts, ends) in self._cars.items():
+            idx = bisect_left(ends, target)
+            if idx < len(starts) and (best is None or (starts[idx], carno) < best[:2]):
+                best = (starts[idx], carno, ends[idx])
+        if best is None:
+            return None
+        return best[1], ReserveRange(date.fromordinal(best[0]), date.fromordinal(best[2]))
+
+    def _boundary(self, point: int) -> int:
+        """Return the segment starting at `point`, splitting one if needed."""
+        idx = bisect_left(self._bounds, point)
+        if idx == len(self._bounds) or self._bounds[idx] != point:
+            self._bounds.insert(idx, point)
+            self._active.insert(idx, self._active[idx - 1] if idx else frozenset())
+        return idx
+
+    def _mark(self, carno: str, lo_day: int, hi_day: int, reserved: bool) -> None:
+        lo = self._boundary(lo_day)
+        hi = self._boundary(hi_day + 1)
+        for idx in range(lo, hi):
+            cars = self._active[idx]
+            self._active[idx] = cars | {carno} if reserved else cars - {carno}
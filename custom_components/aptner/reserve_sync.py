@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from contextlib import aclosing
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import AptnerClient, parse_reserve_page, reserve_days
+from .const import DOMAIN
+from .models import ReserveRange
+from .reserve_index import ReservationIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Bumped when parse_reserve_page changes, so stored pages are re-parsed once
+PARSE_VERSION = 2
+
+def _page_hash(reserved: dict) -> str:
+    """Return a content hash of one reserve page's rows."""
+    rows = reserved.get("reserveList") or []
+    raw = f"{PARSE_VERSION}:" + json.dumps(
+        rows, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def parse_visit_date(value: str) -> date:
+    """Parse a visit date given as yyyy.MM.dd or yyyy-MM-dd."""
+    return date.fromisoformat(str(value).strip().replace(".", "-"))
+
+def reservation_dates(start: date, days: int) -> set[date]:
+    """Return the dates covered by a reservation of `days` days from start."""
+    return {start + timedelta(days=offset) for offset in range(max(1, days))}
+
+def covered_dates(ranges: dict[str, list[ReserveRange]] | None) -> dict[str, set[date]]:
+    """Expand per-car reserve ranges into per-car date sets."""
+    covered: dict[str, set[date]] = {}
+    for car, items in (ranges or {}).items():
+        dates = covered.setdefault(car, set())
+        for item in items:
+            dates |= item.dates()
+    return covered
+
+class AptnerReserveSync:
+    """Incremental /pc/reserves sync with persisted per-page fingerprints.
+
+    Each page's hash and parsed {carNo: [dates]} contribution is kept in a
+    Store, together with the merged per-car date sets. Unchanged pages are
+    neither re-parsed nor re-merged, and paging stops at the first page whose
+    rows all ended before today. The merged dates feed a ReservationIndex
+    that is updated only for the cars a changed page touches.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, client: AptnerClient | None, entry_id: str
+    ) -> None:
+        self._client = client
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.reserves"
+        )
+        # page -> {"hash": str, "cars": {carNo: [iso dates]}, "max": iso | None}
+        self._pages: dict[int, dict[str, Any]] = {}
+        self._dates: dict[str, list[str]] = {}
+        self.index = ReservationIndex()
+        # 쓰기 반영(write-through)으로 인덱스에 더해져 다음 동기화 때 다시 계산할 차량
+        self._pending: set[str] = set()
+        self.pages_parsed = 0
+        self.pages_skipped = 0
+
+    async def async_load(self) -> None:
+        """Load fingerprints and merged dates from storage."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self._pages = {int(page): info for page, info in stored.get("pages", {}).items()}
+        self._dates = stored.get("dates", {})
+        for car, dates in self._dates.items():
+            self.index.set_car(car, map(date.fromisoformat, dates))
+
+    async def async_remove(self) -> None:
+        """Remove persisted sync state."""
+        await self._store.async_remove()
+
+    @property
+    def dates(self) -> dict[str, list[str]]:
+        """Return merged per-car visit dates (ISO strings)."""
+        return self._dates
+
+    def apply_reservation(self, carno: str, start: date, days: int) -> None:
+        """Add a just-made reservation to the index until the next sync confirms it."""
+        self.index.add(carno, start, start + timedelta(days=max(1, days) - 1))
+        self._pending.add(carno)
+
+    async def async_sync(self) -> dict[str, list[ReserveRange]]:
+        """Sync reserve pages and return per-car upcoming ranges."""
+        today = date.today()
+        today_iso = today.isoformat()
+        seen: set[int] = set()
+        changed = False
+        touched, self._pending = self._pending, set()
+
+        try:
+            async with aclosing(self._client.async_iter_reserve_pages()) as pages:
+                async for page, reserved in pages:
+                    seen.add(page)
+                    prev = self._pages.get(page)
+                    if reserved is None:
+                        # 실패한 페이지는 이전 결과 유지
+                        if prev is None:
+                            continue
+                        info = prev
+                    else:
+                        digest = _page_hash(reserved)
+                        if prev is not None and prev["hash"] == digest:
+                            self.pages_skipped += 1
+                            info = prev
+                        else:
+                            self.pages_parsed += 1
+                            cars, _ = parse_reserve_page(reserved, today)
+                            if prev is not None:
+                                touched.update(prev["cars"])
+                            touched.update(cars)
+                            info = {
+                                "hash": digest,
+                                "cars": {
+                                    car: sorted({d.isoformat() for d in dates})
+                                    for car, dates in cars.items()
+                                },
+                                "max": _last_reserved_date(reserved),
+                            }
+                            self._pages[page] = info
+                            changed = True
+                    if info["max"] is not None and info["max"] < today_iso:
+                        break
+        except BaseException:
+            # 다음 동기화에서 다시 병합 (쓰기 반영 차량, 이미 바뀐 페이지의 차량)
+            self._pending |= touched
+            raise
+
+        for page in set(self._pages) - seen:
+            touched.update(self._pages.pop(page)["cars"])
+            changed = True
+
+        # 바뀐 페이지에 나온 차량만 다시 병합
+        for car in touched:
+            merged: set[str] = set()
+            for info in self._pages.values():
+                merged.update(info["cars"].get(car, ()))
+            if merged:
+                self._dates[car] = sorted(merged)
+            else:
+                self._dates.pop(car, None)
+            self.index.set_car(car, map(date.fromisoformat, merged))
+        if changed:
+            self._store.async_delay_save(self._data_to_save, 10)
+
+        self.index.prune(today)
+        return self.index.ranges(today)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "pages": {str(page): info for page, info in self._pages.items()},
+            "dates": self._dates,
+        }
+
+def _last_reserved_date(reserved: dict) -> str | None:
+    """Return the last day booked by any row on a page as an ISO string."""
+    latest: str | None = None
+    for item in reserved.get("reserveList") or []:
+        try:
+            visit_date = parse_visit_date(item.get("visitDate") or "")
+        except ValueError:
+            return None
+        value = (visit_date + timedelta(days=reserve_days(item) - 1)).isoformat()
+        if latest is None or value > latest:
+            latest = value
+    return latest
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientConnectorError,
+    ClientPayloadError,
+    ClientResponseError,
+)
+
+# HTTP statuses worth retrying; every other 4xx is permanent
+TRANSIENT_STATUSES = {408, 425, 429}
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+def is_transient(err: BaseException) -> bool:
+    """Return True for errors a retry may fix (5xx, 429, timeouts, resets)."""
+    if isinstance(err, ClientResponseError):
+        return err.status >= 500 or err.status in TRANSIENT_STATUSES
+    return isinstance(
+        err, (asyncio.TimeoutError, ClientConnectionError, ClientPayloadError)
+    )
+
+def is_ambiguous(err: BaseException) -> bool:
+    """Return True if the server may have processed the request despite the error.
+
+    5xx responses, timeouts and connections dropped mid-request are
+    ambiguous; a 4xx (incl. 429) or a connection that was never
+    established means the request was not processed.
+    """
+    if isinstance(err, ClientResponseError):
+        return err.status >= 500
+    if isinstance(err, ClientConnectorError):
+        return False
+    return is_transient(err)
+
+def retry_after(err: BaseException) -> float | None:
+    """Return the Retry-After delay (seconds) of an HTTP error, if any."""
+    headers = getattr(err, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Jittered exponential back-off bounded by a total time budget."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 4.0
+    # Total seconds a request may spend including retries
+    budget: float = 8.0
+
+    def backoff(self, retry: int) -> float:
+        """Return the full-jitter delay before retry number `retry` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    Opens after `failure_threshold` consecutive transient failures and fails
+    fast until `reset_timeout` has passed. Then one half-open probe is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the current state."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until a request would be let through (0 if allowed now)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN:
+            return False
+        now = time.monotonic()
+        # 동시에 하나의 probe만 허용 (응답 없이 끝난 probe는 timeout 후 재허용)
+        if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+            return False
+        self._probe_started = now
+        return True
+
+    def record_success(self) -> None:
+        """Record that the endpoint answered (including permanent 4xx)."""
+        self.failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Record a request that failed after its retries."""
+        self.failures += 1
+        self._probe_started = None
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in(), 1),
+        }
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+
+from .const import (
+    ADAPTIVE_FAST_INTERVAL,
+    ADAPTIVE_FAST_WINDOW,
+    ADAPTIVE_IDLE_AFTER,
+    ADAPTIVE_MAX_INTERVAL,
+)
+
+def parse_active_hours(value: str | None) -> list[tuple[int, int]]:
+    """Parse "7-9, 18-22" into [(7, 9), (18, 22)] (end hour exclusive).
+
+    Ranges may wrap past midnight ("22-2"). Raises ValueError on bad input.
+    """
+    ranges: list[tuple[int, int]] = []
+    for part in (value or "").replace(" ", "").split(","):
+        if not part:
+            continue
+        start_str, sep, end_str = part.partition("-")
+        if not sep:
+            raise ValueError(f"Invalid hour range: {part}")
+        start, end = int(start_str), int(end_str)
+        if not (0 <= start <= 23 and 0 <= end <= 24) or start == end:
+            raise ValueError(f"Invalid hour range: {part}")
+        ranges.append((start, end))
+    return ranges
+
+class AdaptivePollScheduler:
+    """Pick the car status polling interval from recent parking activity.
+
+    - Fast polling for a while after any in/out transition and during the
+      configured active hours.
+    - Exponential back-off (up to ADAPTIVE_MAX_INTERVAL) once nothing has
+      changed for ADAPTIVE_IDLE_AFTER.
+    - Never faster than the account's hourly request budget allows.
+    """
+
+    def __init__(
+        self,
+        base_interval: timedelta,
+        *,
+        active_hours: list[tuple[int, int]] | None = None,
+        fast_interval: timedelta = ADAPTIVE_FAST_INTERVAL,
+        fast_window: timedelta = ADAPTIVE_FAST_WINDOW,
+        idle_after: timedelta = ADAPTIVE_IDLE_AFTER,
+        max_interval: timedelta = ADAPTIVE_MAX_INTERVAL,
+    ) -> None:
+        self.base_interval = base_interval
+        self.active_hours = active_hours or []
+        self.fast_interval = min(fast_interval, base_interval)
+        self.fast_window = fast_window
+        self.idle_after = idle_after
+        self.max_interval = max(max_interval, base_interval)
+        # Epoch seconds of the last observed transition
+        self.last_change: float | None = None
+        self.target_interval = base_interval
+        self.current_interval = base_interval
+
+    def record(self, changed: bool, now: float) -> None:
+        """Record the outcome of one poll."""
+        if changed or self.last_change is None:
+            self.last_change = now
+
+    def is_active_hour(self, local_now: datetime) -> bool:
+        """Return True if local_now falls in a configured active hour range."""
+        hour = local_now.hour
+        for start, end in self.active_hours:
+            if start < end:
+                if start <= hour < end:
+                    return True
+            elif hour >= start or hour < end:
+                return True
+        return False
+
+    def next_interval(
+        self, now: float, local_now: datetime, budget_wait: float = 0
+    ) -> timedelta:
+        """Return the interval until the next poll.
+
+        budget_wait is how long (seconds) the account must wait before its
+        request budget allows another request.
+        """
+        quiet = now - self.last_change if self.last_change is not None else 0
+        if quiet < self.fast_window.total_seconds() or self.is_active_hour(local_now):
+            target = self.fast_interval
+        elif quiet < self.idle_after.total_seconds():
+            target = self.base_interval
+        else:
+            # 변화가 없을수록 간격을 두 배씩 늘림
+            steps = int(quiet // self.idle_after.total_seconds())
+            factor = 2 ** min(steps, int(math.log2(self.max_interval / self.base_interval)) + 1)
+            target = min(self.max_interval, self.base_interval * factor)
+
+        self.target_interval = target
+        self.current_interval = max(target, timedelta(seconds=budget_wait))
+        return self.current_interval
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import logging
-from datetime import timedelta
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import MATCH_ALL, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DOMAIN, CONF_CARS, CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN
+from .const import DOMAIN, SOURCE_FEE, SOURCE_METRICS, SOURCE_RESERVE
+from .coordinator import AptnerDataCoordinator
+from .entity import AptnerEntity, entry_device_info
+from .models import Fee, ReserveRange
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,131 +21,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Set up Aptner sensors from a config entry."""
     _LOGGER.debug("Setting up sensors for entry: %s", entry.entry_id)
     
-    data = hass.data[DOMAIN][entry.entry_id]
-    client = data["client"]
+    coordinator: AptnerDataCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     
-    # Get scan interval from options or config
-    if entry.options:
-        scan_min = entry.options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN)
-    else:
-        scan_min = entry.data.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN)
-    
-    update_interval = timedelta(minutes=int(scan_min))
-    
-    entities: list[SensorEntity] = []
-    
-    # 1. 관리비 센서 생성 시도 (실패해도 계속 진행)
-    fee_entity = None
-    try:
-        # Fee coordinator
-        async def async_update_fee() -> dict[str, Any]:
-            try:
-                return await client.get_fee()
-            except Exception as err:
-                # 404 에러는 관리비 정보가 없는 경우로 간주
-                if "404" in str(err) or "관리비 정보가 존재하지 않습니다" in str(err):
-                    _LOGGER.debug("No fee information available for this account")
-                    return {}  # 빈 데이터 반환
-                raise UpdateFailed(f"Error fetching fee data: {err}") from err
-        
-        fee_coordinator = DataUpdateCoordinator(
-            hass,
-            logger=_LOGGER,
-            name=f"{DOMAIN}_fee_{entry.entry_id}",
-            update_method=async_update_fee,
-            update_interval=update_interval,
-        )
-        
-        # 첫 번째 업데이트 시도 (실패해도 계속 진행)
-        try:
-            await fee_coordinator.async_config_entry_first_refresh()
-        except Exception as err:
-            # 404 에러는 무시 (관리비 정보 없음)
-            if "404" in str(err) or "관리비 정보가 존재하지 않습니다" in str(err):
-                _LOGGER.info("This account doesn't have fee information. Skipping fee sensor.")
-                # 빈 데이터로 초기화
-                fee_coordinator.data = {}
-            else:
-                _LOGGER.warning("Failed to initialize fee coordinator: %s", err)
-                # 다른 에러도 무시하고 계속 진행
-        
-        # 관리비 센서 생성 (데이터가 있으면 생성)
-        fee_entity = AptnerFeeAmountSensor(entry, fee_coordinator)
-        entities.append(fee_entity)
-        _LOGGER.debug("Created fee sensor")
-        
-    except Exception as err:
-        _LOGGER.warning("Failed to setup fee sensor: %s. Continuing with other sensors.", err)
-    
-    # 2. 방문차량 예약현황 센서 생성
-    try:
-        # Reserve coordinator
-        async def async_update_reserve() -> dict[str, Any]:
-            try:
-                return await client.get_reserve_status()
-            except Exception as err:
-                raise UpdateFailed(f"Error fetching reserve data: {err}") from err
-        
-        reserve_coordinator = DataUpdateCoordinator(
-            hass,
-            logger=_LOGGER,
-            name=f"{DOMAIN}_reserve_{entry.entry_id}",
-            update_method=async_update_reserve,
-            update_interval=update_interval,
-        )
-        
-        # 첫 번째 업데이트 시도
-        try:
-            await reserve_coordinator.async_config_entry_first_refresh()
-        except Exception as err:
-            _LOGGER.error("Failed to initialize reserve coordinator: %s", err)
-            # 방문차량 정보가 없을 수도 있지만, 센서는 생성
-            reserve_coordinator.data = {}
-        
-        # 방문차량 예약현황 센서 생성
-        reserve_entity = AptnerReserveOverviewSensor(entry, reserve_coordinator)
-        entities.append(reserve_entity)
-        _LOGGER.debug("Created reserve sensor")
-        
-    except Exception as err:
-        _LOGGER.error("Failed to setup reserve sensor: %s", err)
-        raise ConfigEntryNotReady from err
-    
-    # 센서 추가
-    if entities:
-        async_add_entities(entities)
-        _LOGGER.debug("Added %d sensor entities", len(entities))
-    else:
-        _LOGGER.warning("No sensors were created for entry: %s", entry.entry_id)
-
-def _device_info(entry: ConfigEntry) -> DeviceInfo:
-    """Return device info."""
-    return DeviceInfo(
-        identifiers={(DOMAIN, entry.entry_id)},
-        name="Aptner",
-        manufacturer="Aptner",
-        model="v2 API",
+    entities: list[SensorEntity] = [
+        AptnerFeeAmountSensor(entry, coordinator),  # 관리비 센서
+        AptnerReserveOverviewSensor(entry, coordinator),  # 방문차량 예약현황 센서
+        AptnerApiLatencySensor(entry, coordinator),  # 진단: API 응답시간
+        AptnerApiRequestsSensor(entry, coordinator),  # 진단: API 요청 수
+    ]
+    async_add_entities(entities)
+    _LOGGER.debug("Added %d sensor entities", len(entities))
+
+def _reserve_hash(data: dict[str, list[ReserveRange]]) -> str:
+    """Return a short, car-order-independent hash of reserve data."""
+    raw = ";".join(
+        f"{car}:{item.start.isoformat()}~{item.end.isoformat()}"
+        for car in sorted(data)
+        for item in data[car]
     )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
 
-class AptnerBaseSensor(CoordinatorEntity, SensorEntity):
+class AptnerBaseSensor(AptnerEntity, SensorEntity):
     """Base class for Aptner sensors."""
     
     _attr_has_entity_name = True
+    _source: str
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        # context = 데이터 소스; 해당 소스가 바뀔 때만 상태 갱신
+        super().__init__(coordinator, context=self._source)
         self._entry = entry
-        self._attr_device_info = _device_info(entry)
+        self._attr_device_info = entry_device_info(entry)
+
+    @property
+    def source_data(self) -> Any:
+        """Return this sensor's slice of the coordinator data."""
+        return (self.coordinator.data or {}).get(self._source)
+
+    @property
+    def has_data(self) -> bool:
+        """Return True once this sensor's source has been fetched."""
+        return self.source_data is not None
 
 class AptnerFeeAmountSensor(AptnerBaseSensor):
     """Sensor for fee amount."""
     
     _attr_name = "관리비"
+    _source = SOURCE_FEE
     _attr_device_class = SensorDeviceClass.MONETARY
     _attr_native_unit_of_measurement = "KRW"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
         """Initialize the fee amount sensor."""
         super().__init__(entry, coordinator)
         self._attr_unique_id = f"{entry.entry_id}_fee_amount"
@@ -152,37 +80,35 @@ class AptnerFeeAmountSensor(AptnerBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or "fee" not in data:
-            return None
-        return data.get("fee")
+        fee: Fee | None = self.source_data
+        return fee.amount if fee is not None else None
 
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
-        data = self.coordinator.data
-        if not data or not isinstance(data, dict):
+        fee: Fee | None = self.source_data
+        if fee is None:
             return {}
         return {
-            "year": data.get("year"),
-            "month": data.get("month"),
-            "details": data.get("details", {}),
+            "year": fee.year,
+            "month": fee.month,
+            "details": fee.details,
         }
 
     @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        # 데이터가 있고 fee 정보가 있으면 available
-        data = self.coordinator.data
-        return bool(data and isinstance(data, dict) and "fee" in data)
+    def has_data(self) -> bool:
+        """Return True if fee data was fetched."""
+        # 관리비 정보가 있으면 available
+        return isinstance(self.source_data, Fee)
 
 class AptnerReserveOverviewSensor(AptnerBaseSensor):
     """Sensor for reserve overview."""
     
     _attr_name = "방문차량 예약현황"
     _attr_icon = "mdi:car-clock"
+    _source = SOURCE_RESERVE
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
         """Initialize the reserve overview sensor."""
         super().__init__(entry, coordinator)
         self._attr_unique_id = f"{entry.entry_id}_reserve_overview"
@@ -190,15 +116,90 @@ class AptnerReserveOverviewSensor(AptnerBaseSensor):
     @property
     def native_value(self):
         """Return the number of cars with future reservations."""
-        data = self.coordinator.data
+        data = self.source_data
         if not data or not isinstance(data, dict):
             return 0
         return len(data)
 
     @property
     def extra_state_attributes(self):
-        """Return the reservation data."""
-        data = self.coordinator.data
+        """Return the range count and a content hash (details live in the calendar)."""
+        data = self.source_data
         if not data or not isinstance(data, dict):
-            return {"cars": {}}
-        return {"cars": data}
+            return {"ranges": 0, "hash": None}
+        return {
+            "ranges": sum(len(ranges) for ranges in data.values()),
+            "hash": _reserve_hash(data),
+        }
+
+class AptnerApiLatencySensor(AptnerBaseSensor):
+    """Diagnostic sensor for mean API latency."""
+
+    _attr_name = "API 응답시간"
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _source = SOURCE_METRICS
+    # 매 조회마다 바뀌는 상세 지표는 기록하지 않음 (진단 정보에서 확인)
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+    has_data = True  # 클라이언트 지표는 항상 존재
+
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
+        """Initialize the API latency sensor."""
+        super().__init__(entry, coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_api_latency"
+
+    @property
+    def native_value(self):
+        """Return the mean latency over all endpoints (ms)."""
+        avg = self.coordinator.client.metrics.latency_avg
+        return round(avg * 1000, 1) if avg is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return per-endpoint latency (ms)."""
+        return {
+            endpoint: {
+                "avg": data["latency_avg_ms"],
+                "max": data["latency_max_ms"],
+                "parse": data["parse_time_ms"],
+            }
+            for endpoint, data in self.coordinator.client.metrics.as_dict().items()
+        }
+
+class AptnerApiRequestsSensor(AptnerBaseSensor):
+    """Diagnostic sensor for API request counters."""
+
+    _attr_name = "API 요청 수"
+    _attr_icon = "mdi:counter"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _source = SOURCE_METRICS
+    # 매 조회마다 바뀌는 상세 지표는 기록하지 않음 (진단 정보에서 확인)
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+    has_data = True  # 클라이언트 지표는 항상 존재
+
+    def __init__(self, entry: ConfigEntry, coordinator: AptnerDataCoordinator) -> None:
+        """Initialize the API requests sensor."""
+        super().__init__(entry, coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_api_requests"
+
+    @property
+    def native_value(self):
+        """Return the number of HTTP round trips since startup."""
+        return int(self.coordinator.client.metrics.total("requests"))
+
+    @property
+    def extra_state_attributes(self):
+        """Return retry, re-auth, payload size and cache counters."""
+        metrics = self.coordinator.client.metrics
+        return {
+            "errors": int(metrics.total("errors")),
+            "retries": int(metrics.total("retries")),
+            "reauths": int(metrics.total("reauths")),
+            "bytes_total": int(metrics.total("bytes_total")),
+            "cache": self.coordinator.client.cache_stats,
+            "breakers": self.coordinator.breaker_states,
+        }
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .api import AptnerNotFoundError
+from .const import (
+    BULK_RESERVE_CONCURRENCY,
+    DEFAULT_RESERVE_PURPOSE,
+    DOMAIN,
+    MAX_RESERVE_DAYS,
+    SOURCE_FEE,
+    SOURCE_RESERVE,
+)
+from .coordinator import AptnerDataCoordinator
+from .models import reserve_ranges_as_dict
+from .reserve_sync import covered_dates, parse_visit_date, reservation_dates
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_FEE = "fee"
+SERVICE_FINDCAR = "findcar"
+SERVICE_GET_CAR_STATUS = "get_car_status"  # 새로운 서비스
+SERVICE_GET_RESERVE_STATUS = "get_reserve_status"
+SERVICE_RESERVE_CAR = "reserve_car"
+SERVICE_RESERVE_CARS = "reserve_cars"
+SERVICE_CHECK_RESERVATION = "check_reservation"
+
+# 이 시간(초)보다 최신인 코디네이터 데이터로 응답
+MAX_AGE = vol.All(vol.Coerce(float), vol.Range(min=0))
+
+RESERVATION_SCHEMA = vol.Schema(
+    {
+        vol.Required("carno"): str,
+        vol.Required("date"): str,     # yyyy.MM.dd 또는 yyyy-MM-dd
+        vol.Optional("days", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_RESERVE_DAYS)
+        ),
+        vol.Optional("purpose"): str,
+        vol.Optional("phone"): str,
+    }
+)
+
+# Per-entry handler: (call, coordinator) -> response
+Handler = Callable[[ServiceCall, AptnerDataCoordinator], Awaitable[Any]]
+
+def _coordinators(hass: HomeAssistant, call: ServiceCall) -> dict[str, AptnerDataCoordinator]:
+    """Return the coordinators a call targets (one if entry_id is given)."""
+    loaded = {
+        entry_id: data["coordinator"] for entry_id, data in hass.data.get(DOMAIN, {}).items()
+    }
+    if not loaded:
+        raise HomeAssistantError("No Aptner account is loaded")
+    entry_id = call.data.get("entry_id")
+    if entry_id is None:
+        return loaded
+    if entry_id not in loaded:
+        raise HomeAssistantError(f"Unknown Aptner entry_id: {entry_id}")
+    return {entry_id: loaded[entry_id]}
+
+def _query_service(
+    hass: HomeAssistant, name: str, handler: Handler
+) -> Callable[[ServiceCall], Awaitable[Any]]:
+    """Wrap a per-entry handler; without entry_id all accounts are queried concurrently.
+
+    With entry_id the response is that entry's, as-is. Without it, the
+    response is always keyed by entry_id (however many accounts are
+    loaded), and a failing account reports {"error": ...} unless every
+    account failed.
+    """
+
+    async def service(call: ServiceCall) -> Any:
+        coordinators = _coordinators(hass, call)
+        if call.data.get("entry_id") is not None:
+            try:
+                return await handler(call, next(iter(coordinators.values())))
+            except HomeAssistantError:
+                raise
+            except Exception as e:
+                raise HomeAssistantError(f"Aptner {name} failed: {e}") from e
+
+        results = await asyncio.gather(
+            *(handler(call, coordinator) for coordinator in coordinators.values()),
+            return_exceptions=True,
+        )
+        if all(isinstance(result, BaseException) for result in results):
+            raise HomeAssistantError(
+                f"Aptner {name} failed: "
+                + "; ".join(f"{entry_id}: {e}" for entry_id, e in zip(coordinators, results))
+            )
+        response: dict[str, Any] = {}
+        for entry_id, result in zip(coordinators, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning("Aptner %s failed for %s: %s", name, entry_id, result)
+                result = {"error": str(result)}
+            response[entry_id] = result
+        return response
+
+    return service
+
+def _single_entry(hass: HomeAssistant, call: ServiceCall) -> AptnerDataCoordinator:
+    """Return the target coordinator of a write service."""
+    coordinators = _coordinators(hass, call)
+    if len(coordinators) > 1:
+        raise HomeAssistantError(
+            "entry_id is required when several Aptner accounts are configured"
+        )
+    return next(iter(coordinators.values()))
+
+async def _fee(call: ServiceCall, coordinator: AptnerDataCoordinator) -> Any:
+    if (max_age := call.data.get("max_age")) is not None:
+        # 코디네이터 데이터가 충분히 최신이면 메모리에서 응답
+        fee = await coordinator.async_get_source(SOURCE_FEE, max_age)
+        if fee is None:
+            raise AptnerNotFoundError("No fee data for this account")
+    else:
+        fee = await coordinator.client.get_fee()
+    return fee.as_dict()
+
+async def _findcar(call: ServiceCall, coordinator: AptnerDataCoordinator) -> Any:
+    return await coordinator.client.find_car(
+        carno=call.data.get("carno"), max_age=call.data.get("max_age")
+    )
+
+async def _get_car_status(call: ServiceCall, coordinator: AptnerDataCoordinator) -> Any:
+    """Get current car status for device tracking."""
+    statuses = await coordinator.client.get_car_status(
+        carno=call.data.get("carno"), max_age=call.data.get("max_age")
+    )
+    return {carno: status.as_dict() for carno, status in statuses.items()}
+
+async def _get_reserve_status(call: ServiceCall, coordinator: AptnerDataCoordinator) -> Any:
+    """Answer from the reservation index, synced first unless max_age allows.
+
+    Without max_age the pages are re-read from the API; unchanged pages are
+    skipped by the incremental sync and the ranges come from the index.
+    """
+    ranges = await coordinator.async_get_source(SOURCE_RESERVE, call.data.get("max_age", 0))
+    return reserve_ranges_as_dict(ranges)
+
+async def _check_reservation(call: ServiceCall, coordinator: AptnerDataCoordinator) -> Any:
+    """Answer from the reservation index (no API call)."""
+    day: date = call.data.get("date") or dt_util.now().date()
+    index = coordinator.reserve_sync.index
+    response: dict[str, Any] = {
+        "date": day.isoformat(),
+        "cars": sorted(index.cars_on(day)),
+    }
+    if (carno := call.data.get("carno")) is not None:
+        reserved = index.range_on(carno, day)
+        response.update(
+            carno=carno,
+            reserved=reserved is not None,
+            range=reserved.as_dict() if reserved is not None else None,
+        )
+    return response
+
+async def _reserve_car(hass: HomeAssistant, call: ServiceCall) -> None:
+    coordinator = _single_entry(hass, call)
+    try:
+        await coordinator.client.reserve_car(
+            date=call.data["date"],
+            purpose=call.data["purpose"],
+            carno=call.data["carno"],
+            days=int(call.data["days"]),
+            phone=call.data["phone"],
+        )
+    except Exception as e:
+        raise HomeAssistantError(f"Aptner reserve_car failed: {e}") from e
+    try:
+        start = parse_visit_date(call.data["date"])
+    except ValueError:
+        return
+    # 다음 조회를 기다리지 않고 예약 현황에 바로 반영
+    coordinator.async_apply_reservation(call.data["carno"], start, int(call.data["days"]))
+
+async def _reserve_cars(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Reserve several cars; entries already reserved are skipped."""
+    coordinator = _single_entry(hass, call)
+    # 현재 알려진 예약
+    covered = covered_dates((coordinator.data or {}).get(SOURCE_RESERVE))
+    # 이번 요청에서 접수한 (차량, 날짜) -> 그 날짜를 예약하는 항목의 결과
+    claimed: dict[tuple[str, date], dict[str, Any]] = {}
+    # 앞선 항목과 완전히 겹치는 항목: 앞선 항목의 결과가 나온 뒤 상태 결정
+    duplicates: list[tuple[dict[str, Any], list[dict[str, Any]]]] = []
+    semaphore = asyncio.Semaphore(BULK_RESERVE_CONCURRENCY)
+    results: list[dict[str, Any]] = []
+    jobs = []
+
+    async def submit(result: dict[str, Any], item: dict[str, Any], start: date) -> None:
+        async with semaphore:
+            try:
+                await coordinator.client.reserve_car(
+                    date=result["date"],
+                    purpose=item.get("purpose") or call.data["purpose"],
+                    carno=result["carno"],
+                    days=result["days"],
+                    phone=item.get("phone") or call.data["phone"],
+                )
+            except Exception as e:
+                result.update(status="failed", error=str(e))
+            else:
+                result["status"] = "reserved"
+                coordinator.async_apply_reservation(result["carno"], start, result["days"])
+
+    for item in call.data["reservations"]:
+        result = {"carno": item["carno"], "date": item["date"], "days": item["days"]}
+        results.append(result)
+        try:
+            start = parse_visit_date(item["date"])
+        except ValueError:
+            result.update(status="failed", error="invalid date")
+            continue
+        result["date"] = start.strftime("%Y.%m.%d")
+        carno = item["carno"]
+        new_dates = reservation_dates(start, item["days"]) - covered.get(carno, set())
+        if not new_dates:
+            result["status"] = "skipped"
+            continue
+        owners = [claimed.get((carno, day)) for day in new_dates]
+        if all(owners):
+            duplicates.append((result, owners))
+            continue
+        for day in new_dates:
+            claimed.setdefault((carno, day), result)
+        jobs.append(submit(result, item, start))
+
+    await asyncio.gather(*jobs)
+    for result, owners in duplicates:
+        failed = next((owner for owner in owners if owner["status"] == "failed"), None)
+        if failed is None:
+            result["status"] = "skipped"
+        else:
+            result.update(status="failed", error=f"duplicate of a failed entry: {failed['error']}")
+    counts = {
+        status: sum(1 for r in results if r["status"] == status)
+        for status in ("reserved", "skipped", "failed")
+    }
+    return {**counts, "results": results}
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Aptner services once for all config entries."""
+    entry_id = vol.Optional("entry_id")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FEE,
+        _query_service(hass, SERVICE_FEE, _fee),
+        schema=vol.Schema({entry_id: str, vol.Optional("max_age"): MAX_AGE}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FINDCAR,
+        _query_service(hass, SERVICE_FINDCAR, _findcar),
+        schema=vol.Schema({
+            entry_id: str,
+            vol.Optional("carno"): str,
+            vol.Optional("max_age"): MAX_AGE,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CAR_STATUS,
+        _query_service(hass, SERVICE_GET_CAR_STATUS, _get_car_status),
+        schema=vol.Schema({
+            entry_id: str,
+            vol.Optional("carno"): str,
+            vol.Optional("max_age"): MAX_AGE,
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RESERVE_STATUS,
+        _query_service(hass, SERVICE_GET_RESERVE_STATUS, _get_reserve_status),
+        schema=vol.Schema({entry_id: str, vol.Optional("max_age"): MAX_AGE}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CHECK_RESERVATION,
+        _query_service(hass, SERVICE_CHECK_RESERVATION, _check_reservation),
+        schema=vol.Schema({
+            entry_id: str,
+            vol.Optional("carno"): str,
+            # yyyy.MM.dd 또는 yyyy-MM-dd, 생략 시 오늘
+            vol.Optional("date"): vol.All(str, parse_visit_date),
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESERVE_CAR,
+        partial(_reserve_car, hass),
+        schema=vol.Schema(
+            {
+                entry_id: str,
+                vol.Required("date"): str,     # yyyy.MM.dd
+                vol.Required("purpose"): str,
+                vol.Required("carno"): str,
+                vol.Required("days"): vol.Coerce(int),
+                vol.Required("phone"): str,
+            }
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESERVE_CARS,
+        partial(_reserve_cars, hass),
+        schema=vol.Schema(
+            {
+                entry_id: str,
+                vol.Required("reservations"): vol.All(
+                    [RESERVATION_SCHEMA], vol.Length(min=1)
+                ),
+                vol.Optional("purpose", default=DEFAULT_RESERVE_PURPOSE): str,
+                vol.Required("phone"): str,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterator
+
+# A complete string, a bracket, or a lone quote (string not complete yet)
+_TOKEN = re.compile(rb'"(?:[^"\\]++|\\.)*+"|[{}\[\]]|"', re.DOTALL)
+# A complete object without nested objects/arrays (the common case)
+_FLAT_OBJECT = re.compile(rb'\{(?:[^{}\[\]"]++|"(?:[^"\\]++|\\.)*+")*+\}', re.DOTALL)
+_WHITESPACE = b" \t\r\n"
+
+_SCAN = 0  # looking for the key
+_COLON = 1  # key seen, expecting ':'
+_OPEN = 2  # ':' seen, expecting '['
+_ARRAY = 3  # between array elements
+_ELEMENT = 4  # inside an array element
+
+class JsonArrayStreamer:
+    """Incrementally extract the elements of every JSON array stored under `key`.
+
+    Feed raw response chunks; each complete array element (object or array)
+    is decoded and yielded as soon as its closing bracket arrives. Only the
+    element being parsed is buffered, so memory stays proportional to one
+    element rather than the whole document.
+    """
+
+    def __init__(self, key: str, loads: Callable[[bytes], Any] = json.loads) -> None:
+        self._key = json.dumps(key, ensure_ascii=False).encode("utf-8")
+        self._loads = loads
+        self._buf = bytearray()
+        self._pos = 0
+        self._state = _SCAN
+        self._start = 0
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        """Consume a chunk and yield the elements it completes."""
+        buf = self._buf
+        buf += chunk
+        pos = self._pos
+        size = len(buf)
+
+        while pos < size:
+            state = self._state
+            if state == _ELEMENT or state == _SCAN:
+                match = _TOKEN.search(buf, pos)
+                if match is None:
+                    pos = size
+                    break
+                start, end = match.span()
+                if end - start == 1 and buf[start] == 0x22:
+                    pos = start
+                    break  # 문자열이 다음 청크에서 끝남
+                pos = end
+                char = buf[start]
+                if state == _SCAN:
+                    if char == 0x22 and buf[start:end] == self._key:
+                        self._state = _COLON
+                elif char == 0x22:
+                    pass
+                elif char in b"{[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        yield self._loads(bytes(buf[self._start:pos]))
+                        self._state = _ARRAY
+            else:
+                char = buf[pos]
+                if char in _WHITESPACE:
+                    pos += 1
+                elif state == _COLON:
+                    self._state = _OPEN if char == 0x3A else _SCAN  # ':'
+                    if char == 0x3A:
+                        pos += 1
+                elif state == _OPEN:
+                    if char == 0x5B:  # '['
+                        self._state = _ARRAY
+                        pos += 1
+                    else:
+                        self._state = _SCAN  # not an array (e.g. null)
+                elif char == 0x2C:  # ','
+                    pos += 1
+                elif char == 0x7B and (flat := _FLAT_OBJECT.match(buf, pos)):
+                    # 중첩 없는 객체는 정규식 한 번으로 처리
+                    pos = flat.end()
+                    yield self._loads(bytes(buf[flat.start():pos]))
+                elif char in b"{[":
+                    self._state = _ELEMENT
+                    self._start = pos
+                    self._depth = 1
+                    pos += 1
+                else:
+                    # ']' or a scalar element: back to scanning for the key
+                    self._state = _SCAN
+                    if char == 0x5D:
+                        pos += 1
+
+        # Drop consumed bytes, keeping the element in progress
+        cut = self._start if self._state == _ELEMENT else pos
+        del buf[:cut]
+        self._start -= cut
+        self._pos = pos - cut
+
+def iter_json_arrays(data: Any, key: str) -> Iterator[Any]:
+    """Yield the elements of every array under `key` in a decoded document.
+
+    The whole-document counterpart of JsonArrayStreamer: elements are
+    yielded in document order, and only objects and arrays are yielded.
+    """
+    if isinstance(data, dict):
+        for name, value in data.items():
+            if name == key and isinstance(value, list):
+                for item in value:
+                    if isinstance(item, (dict, list)):
+                        yield item
+            else:
+                yield from iter_json_arrays(value, key)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_json_arrays(value, key)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+def account_key(user_id: str) -> str:
+    """Return a short, non-reversible storage key for an account."""
+    return hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:16]
+
+def token_expiry(token: str) -> float | None:
+    """Return the `exp` claim (epoch seconds) of a JWT access token, if any."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        # 불투명 토큰이면 만료시간을 알 수 없음
+        return None
+
+class AptnerTokenStore:
+    """Access token persisted per account in private (owner-only) storage.
+
+    The token is stored as-is: the config entry in the same directory holds
+    the account password, so encrypting with a key derived from it would
+    add nothing.
+    """
+
+    def __init__(self, hass: HomeAssistant, user_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.token_{account_key(user_id)}", private=True
+        )
+
+    async def async_load(self) -> str | None:
+        """Return the stored token, or None if missing or expired."""
+        stored = await self._store.async_load()
+        # 이전 버전은 암호화된 토큰을 "token"에 저장 (무시하고 재인증)
+        token = stored.get("access_token") if stored else None
+        if not token:
+            return None
+        expires = token_expiry(token)
+        if expires is not None and expires <= time.time():
+            return None
+        return token
+
+    async def async_save(self, token: str) -> None:
+        """Write the token to storage."""
+        await self._store.async_save({"access_token": token})
+
+    def async_delay_save(self, token: str) -> None:
+        """Schedule the token to be written to storage."""
+        self._store.async_delay_save(lambda: {"access_token": token}, 0)
+
+    async def async_remove(self) -> None:
+        """Delete the stored token."""
+        await self._store.async_remove()
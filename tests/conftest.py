@@ -0,0 +1,54 @@
+"""Shared fixtures: a bare Home Assistant instance and the mock Aptner API."""
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import pytest_asyncio
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from benchmarks.mock_server import MockAptnerServer, generate_dataset
+from custom_components.aptner.api import AptnerClient
+from custom_components.aptner.const import CONF_CARS, CONF_ID, CONF_PASSWORD, DOMAIN
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+from custom_components.aptner.reserve_sync import AptnerReserveSync
+
+@pytest_asyncio.fixture
+async def hass(tmp_path) -> AsyncIterator[HomeAssistant]:
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[MockAptnerServer]:
+    server = MockAptnerServer(generate_dataset(reports=300, reserve_pages=5, cars=20))
+    await server.start()
+    yield server
+    await server.stop()
+
+@pytest_asyncio.fixture
+async def client(hass: HomeAssistant, server: MockAptnerServer) -> AsyncIterator[AptnerClient]:
+    client = AptnerClient(hass, "user", "secret", base_url=server.base_url)
+    yield client
+    await client.async_close()
+
+@pytest_asyncio.fixture
+async def coordinator(
+    hass: HomeAssistant, client: AptnerClient, server: MockAptnerServer
+) -> AsyncIterator[AptnerDataCoordinator]:
+    """Coordinator of an entry tracking the first three cars of the dataset."""
+    await client.authenticate()
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Aptner",
+        data={CONF_ID: "user", CONF_PASSWORD: "secret"},
+        source="user",
+        options={CONF_CARS: server.dataset.cars[:3]},
+    )
+    coordinator = AptnerDataCoordinator(
+        hass, entry, client, AptnerReserveSync(hass, client, entry.entry_id)
+    )
+    yield coordinator
+    await coordinator.async_shutdown()
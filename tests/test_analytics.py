@@ -0,0 +1,59 @@
+"""Tests for the incremental per-car parking counters."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.aptner.analytics import CarParkingStats
+from custom_components.aptner.event_index import FLAG_IN, FLAG_OUT, CarEvents
+
+TZ = timezone(timedelta(hours=9))
+
+def _ts(day: int, hour: int) -> float:
+    return datetime(2025, 1, day, hour, tzinfo=TZ).timestamp()
+
+def test_visit_over_midnight_is_split_per_day() -> None:
+    events = CarEvents()
+    events.insert(_ts(1, 22), FLAG_IN, "")
+    events.insert(_ts(2, 3), FLAG_OUT, "")
+    stats = CarParkingStats()
+    assert stats.update(events, TZ) == {"2025-01-01", "2025-01-02"}
+    assert stats.days["2025-01-01"][0] == 2 * 3600
+    assert stats.days["2025-01-02"][0] == 3 * 3600
+    rows = stats.rows("2025-01-01", TZ)
+    assert [row["sum"] for row in rows["parked_time"]] == [2.0, 5.0]
+    assert rows["avg_visit"][0]["mean"] == 300.0
+
+def test_only_new_events_are_counted() -> None:
+    events = CarEvents()
+    events.insert(_ts(1, 8), FLAG_IN, "")
+    stats = CarParkingStats()
+    stats.update(events, TZ)
+    assert stats.update(events, TZ) == set()
+    events.insert(_ts(1, 9), FLAG_OUT, "")
+    assert stats.update(events, TZ) == {"2025-01-01"}
+    assert stats.days["2025-01-01"][1] == 1
+    restored = CarParkingStats.from_dict(stats.as_dict())
+    assert restored.processed == stats.processed and restored.open_since is None
+
+def test_late_event_below_processed_is_counted() -> None:
+    events = CarEvents()
+    events.insert(_ts(1, 8), FLAG_IN, "")
+    events.insert(_ts(1, 9), FLAG_OUT, "")
+    events.insert(_ts(2, 1), FLAG_IN, "")
+    stats = CarParkingStats()
+    stats.update(events, TZ)
+    assert stats.processed == _ts(2, 1)
+
+    # 겹침 구간 안에서 늦게 합쳐진 방문 (전날 밤, 자정을 넘김)
+    events.insert(_ts(1, 22), FLAG_IN, "")
+    events.insert(_ts(2, 0), FLAG_OUT, "")
+    touched = stats.update(events, TZ)
+    assert {"2025-01-01", "2025-01-02"} <= touched
+
+    fresh = CarParkingStats()
+    fresh.update(events, TZ)
+    assert stats.days == fresh.days
+    assert stats.open_since == fresh.open_since == _ts(2, 1)
+    assert stats.days["2025-01-01"][1] == 2
+    assert stats.days["2025-01-01"][0] == 3 * 3600
+    assert stats.update(events, TZ) == set()
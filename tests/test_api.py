@@ -0,0 +1,114 @@
+"""Tests for the client's response cache and in-flight request coalescing."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from benchmarks.mock_server import MockAptnerServer
+from custom_components.aptner.api import AptnerClient
+
+class SlowFactory:
+    """Factory that blocks until released and counts its calls."""
+
+    def __init__(self, result: object = "data") -> None:
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+        self.result = result
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call(client: AptnerClient) -> None:
+    factory = SlowFactory()
+    callers = [asyncio.create_task(client._coalesce("key", 30, factory)) for _ in range(3)]
+    await factory.started.wait()
+    factory.release.set()
+    assert await asyncio.gather(*callers) == ["data"] * 3
+    assert factory.calls == 1
+    assert client.cache_stats == {"hits": 0, "misses": 1, "coalesced": 2, "entries": 1}
+
+    # TTL 동안은 캐시에서 응답
+    assert await client._coalesce("key", 30, factory) == "data"
+    assert factory.calls == 1
+    assert client.cache_hits == 1
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_fetched_again(client: AptnerClient) -> None:
+    factory = SlowFactory()
+    factory.release.set()
+    await client._coalesce("key", 0, factory)
+    await client._coalesce("key", 0, factory)
+    assert factory.calls == 2
+
+@pytest.mark.asyncio
+async def test_cancelling_first_caller_keeps_others_running(client: AptnerClient) -> None:
+    factory = SlowFactory()
+    first = asyncio.create_task(client._coalesce("key", 30, factory))
+    await factory.started.wait()
+    second = asyncio.create_task(client._coalesce("key", 30, factory))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    factory.release.set()
+    assert await second == "data"
+    assert not factory.cancelled
+    assert factory.calls == 1
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_with_its_last_caller(client: AptnerClient) -> None:
+    factory = SlowFactory()
+    callers = [asyncio.create_task(client._coalesce("key", 30, factory)) for _ in range(2)]
+    await factory.started.wait()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert factory.cancelled
+    assert not client._inflight and not client._waiters
+
+    # 다음 호출은 새로 요청
+    retry = SlowFactory()
+    retry.release.set()
+    assert await client._coalesce("key", 30, retry) == "data"
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_are_not_cached(client: AptnerClient) -> None:
+    factory = SlowFactory(ValueError("boom"))
+    callers = [asyncio.create_task(client._coalesce("key", 30, factory)) for _ in range(2)]
+    await factory.started.wait()
+    factory.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert client.cache_stats["entries"] == 0
+    assert not client._inflight
+
+@pytest.mark.asyncio
+async def test_get_requests_are_cached_and_reservations_invalidate(
+    client: AptnerClient, server: MockAptnerServer
+) -> None:
+    await client.authenticate()
+    server.reset_counters()
+    await asyncio.gather(*(client.request("GET", "/pc/reserves?pg=1") for _ in range(3)))
+    await client.request("GET", "/pc/reserves?pg=1")
+    assert server.requests["/pc/reserves"] == 1
+
+    await client.reserve_car(
+        date="2025.01.01", purpose="test", carno="12가3456", days=1, phone="010"
+    )
+    await client.request("GET", "/pc/reserves?pg=1")
+    assert server.requests["/pc/reserves"] == 2
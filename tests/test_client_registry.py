@@ -0,0 +1,75 @@
+"""Tests for the per-account shared client registry."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+import custom_components.aptner as aptner
+from custom_components.aptner.api import (
+    AptnerClient,
+    async_acquire_client,
+    async_release_client,
+)
+from custom_components.aptner.const import CONF_ID, CONF_PASSWORD, DATA_CLIENTS, DOMAIN
+
+@pytest.mark.asyncio
+async def test_concurrent_acquire_shares_one_client(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loads = 0
+
+    async def slow_load(self: AptnerClient) -> None:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(AptnerClient, "async_load", slow_load)
+    first, second = await asyncio.gather(
+        async_acquire_client(hass, "user", "secret"),
+        async_acquire_client(hass, "user", "secret"),
+    )
+    assert first is second
+    assert loads == 1
+    assert hass.data[DATA_CLIENTS]["user"]["refs"] == 2
+
+    await async_release_client(hass, "user")
+    assert "user" in hass.data[DATA_CLIENTS]
+    await async_release_client(hass, "user")
+    assert "user" not in hass.data[DATA_CLIENTS]
+
+@pytest.mark.asyncio
+async def test_failed_load_releases_the_reference(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def failing_load(self: AptnerClient) -> None:
+        raise OSError("disk error")
+
+    monkeypatch.setattr(AptnerClient, "async_load", failing_load)
+    with pytest.raises(OSError):
+        await async_acquire_client(hass, "user", "secret")
+    assert not hass.data[DATA_CLIENTS]
+
+@pytest.mark.asyncio
+async def test_failed_entry_setup_releases_the_client(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def failing_restore(self) -> bool:
+        raise ValueError("bad snapshot")
+
+    monkeypatch.setattr(aptner.AptnerDataCoordinator, "async_restore", failing_restore)
+    hass.data[DOMAIN] = {}
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Aptner",
+        data={CONF_ID: "user", CONF_PASSWORD: "secret"},
+        source="user",
+    )
+    with pytest.raises(ValueError):
+        await aptner.async_setup_entry(hass, entry)
+    assert not hass.data[DATA_CLIENTS]
+    assert not hass.data[DOMAIN]
@@ -0,0 +1,108 @@
+"""Tests for the per-entry data coordinator."""
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.mock_server import DATETIME_FORMAT, MockAptnerServer
+from custom_components.aptner.api import AptnerClient
+from custom_components.aptner.const import EVENT_CAR_ENTERED, EVENT_CAR_EXITED, SOURCE_CARS, SOURCE_RESERVE
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+
+def _report(carno: str, entered: datetime, exited: datetime | None) -> dict:
+    return {
+        "carNo": carno,
+        "inDatetime": entered.strftime(DATETIME_FORMAT),
+        "outDatetime": exited.strftime(DATETIME_FORMAT) if exited else None,
+        "isExit": exited is not None,
+    }
+
+@pytest.mark.asyncio
+async def test_poll_interval_change_does_not_notify_trackers(
+    coordinator: AptnerDataCoordinator, client: AptnerClient
+) -> None:
+    await coordinator.async_refresh()
+    notified: list[str] = []
+    for carno in coordinator.cars:
+        coordinator.async_add_listener(lambda c=carno: notified.append(c), (SOURCE_CARS, carno))
+
+    # 요청 예산을 다 써서 폴링 간격이 매번 달라지는 상황
+    client._request_times.extend([time.monotonic()] * 1000)
+    intervals = set()
+    for _ in range(2):
+        coordinator._next_due[SOURCE_CARS] = 0
+        client.invalidate_cache()
+        await coordinator.async_refresh()
+        intervals.add(coordinator.scheduler.current_interval)
+    assert len(intervals) == 2
+    assert notified == []
+
+@pytest.mark.asyncio
+async def test_car_in_and_out_between_polls_fires_both_events(
+    hass, coordinator: AptnerDataCoordinator, client: AptnerClient, server: MockAptnerServer
+) -> None:
+    carno = coordinator.cars[0]
+    now = datetime.now().replace(microsecond=0)
+    reports = [_report(carno, now - timedelta(hours=5), now - timedelta(hours=4))]
+    server.dataset.monthly_access = {
+        "monthlyParkingHistoryList": [
+            {"yearMonth": now.strftime("%Y.%m"), "visitCarUseHistoryReportList": reports}
+        ]
+    }
+    await coordinator.async_refresh()
+
+    fired: list[tuple[str, dict]] = []
+    for event_type in (EVENT_CAR_ENTERED, EVENT_CAR_EXITED):
+        hass.bus.async_listen(event_type, lambda event: fired.append((event.event_type, event.data)))
+
+    # 두 폴링 사이에 입차 후 출차: 상태 스냅샷은 출차 → 출차로 같음
+    entered, exited = now - timedelta(minutes=30), now - timedelta(minutes=10)
+    reports.insert(0, _report(carno, entered, exited))
+    coordinator._next_due[SOURCE_CARS] = 0
+    client.invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert [event_type for event_type, _ in fired] == [EVENT_CAR_ENTERED, EVENT_CAR_EXITED]
+    assert all(data["car_number"] == carno for _, data in fired)
+    assert fired[0][1]["timestamp"] == entered.strftime(DATETIME_FORMAT)
+    assert fired[1][1]["timestamp"] == exited.strftime(DATETIME_FORMAT)
+    assert fired[1][1]["in_datetime"] == entered.strftime(DATETIME_FORMAT)
+
+    # 새 기록이 없으면 다시 발생하지 않음
+    fired.clear()
+    coordinator._next_due[SOURCE_CARS] = 0
+    client.invalidate_cache()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert fired == []
+
+@pytest.mark.asyncio
+async def test_get_source_refreshes_only_when_older_than_max_age(
+    coordinator: AptnerDataCoordinator, server: MockAptnerServer
+) -> None:
+    await coordinator.async_refresh()
+    server.reset_counters()
+    ranges = await coordinator.async_get_source(SOURCE_RESERVE, 3600)
+    assert ranges == coordinator.data[SOURCE_RESERVE]
+    assert server.round_trips == 0
+
+    # 동시에 요청해도 갱신은 한 번
+    results = await asyncio.gather(
+        *(coordinator.async_get_source(SOURCE_RESERVE, 0) for _ in range(3))
+    )
+    assert all(result is results[0] for result in results)
+    sync = coordinator.reserve_sync
+    assert sync.pages_skipped == sync.pages_parsed > 0
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_fetch_due_sources_once(
+    coordinator: AptnerDataCoordinator,
+) -> None:
+    await asyncio.gather(coordinator.async_refresh(), coordinator.async_refresh())
+    sync = coordinator.reserve_sync
+    assert sync.pages_parsed > 0
+    assert sync.pages_skipped == 0
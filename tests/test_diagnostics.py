@@ -0,0 +1,25 @@
+"""Tests for the config entry diagnostics."""
+from __future__ import annotations
+
+import json
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.aptner.const import DOMAIN
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+from custom_components.aptner.diagnostics import async_get_config_entry_diagnostics
+
+@pytest.mark.asyncio
+async def test_credentials_and_plates_are_redacted(
+    hass: HomeAssistant, coordinator: AptnerDataCoordinator
+) -> None:
+    await coordinator.async_refresh()
+    entry = coordinator._entry
+    hass.data[DOMAIN] = {entry.entry_id: {"coordinator": coordinator}}
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    dumped = json.dumps(diagnostics, default=str)
+    assert "secret" not in dumped
+    for carno in coordinator.cars:
+        assert carno not in dumped
+    assert diagnostics["coordinator"]["last_update_success"]
@@ -0,0 +1,54 @@
+"""Tests for skipping unchanged entity state writes."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+from custom_components.aptner.entity import AptnerEntity, _freeze
+
+class _Entity(AptnerEntity):
+    def __init__(self, coordinator: AptnerDataCoordinator) -> None:
+        super().__init__(coordinator)
+        self.value: Any = 1
+        self.attrs: dict[str, Any] = {"a": 1, "b": [1, 2]}
+        self.entity_id = "sensor.aptner_test"
+
+    @property
+    def state(self) -> Any:
+        return self.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self.attrs
+
+def test_freeze_ignores_dict_order_but_not_list_order() -> None:
+    assert _freeze({"a": 1, "b": {"c": [1, 2]}}) == _freeze({"b": {"c": [1, 2]}, "a": 1})
+    assert _freeze([1, 2]) != _freeze([2, 1])
+    assert hash(_freeze({"a": {1, 2}, "b": [{"c": None}]}))
+
+@pytest.mark.asyncio
+async def test_unchanged_state_is_not_written(hass, coordinator: AptnerDataCoordinator) -> None:
+    await coordinator.async_refresh()
+    entity = _Entity(coordinator)
+    entity.hass = hass
+    entity.async_write_ha_state()
+    writes = []
+    hass.bus.async_listen("state_changed", writes.append)
+
+    entity._handle_coordinator_update()
+    entity.attrs = {"b": [1, 2], "a": 1}
+    entity._handle_coordinator_update()
+    await hass.async_block_till_done()
+    assert writes == []
+    assert coordinator.state_writes_skipped == 2
+
+    entity.attrs = {"a": 1, "b": [2, 1]}
+    entity._handle_coordinator_update()
+    entity.value = 2
+    entity._handle_coordinator_update()
+    await hass.async_block_till_done()
+    assert len(writes) == 2
+    assert coordinator.state_writes == 2
+    assert hass.states.get("sensor.aptner_test").state == "2"
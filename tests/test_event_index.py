@@ -0,0 +1,108 @@
+"""Tests for the per-car parking event index."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.aptner.event_index import FLAG_IN, FLAG_OUT, ParkingEventIndex
+
+TZ = timezone(timedelta(hours=9))
+DAY = 86400.0
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=TZ)
+
+def _raw(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+def _index() -> ParkingEventIndex:
+    return ParkingEventIndex(35 * DAY, TZ)
+
+def test_merge_tracks_latest_status() -> None:
+    index = _index()
+    entered = NOW - timedelta(hours=3)
+    left = NOW - timedelta(hours=1)
+    changed = index.merge(
+        [{"carNo": "A", "inDatetime": _raw(entered), "outDatetime": _raw(left)}],
+        NOW.timestamp(),
+    )
+    assert changed == {"A"}
+    status = index.status("A")
+    assert status.is_exit
+    assert status.in_datetime == entered
+    assert status.out_datetime == left
+    assert index.status("B") is None
+
+def test_repeated_reports_are_deduplicated() -> None:
+    index = _index()
+    reports = [{"carNo": "A", "inDatetime": _raw(NOW - timedelta(hours=1))}]
+    assert index.merge(reports, NOW.timestamp()) == {"A"}
+    assert index.merge(reports, NOW.timestamp()) == set()
+    assert list(index.cars["A"].times) == [(NOW - timedelta(hours=1)).timestamp()]
+
+def test_other_car_in_same_second_is_indexed_later() -> None:
+    index = _index()
+    same = _raw(NOW - timedelta(minutes=5))
+    index.merge([{"carNo": "A", "inDatetime": same}], NOW.timestamp())
+    # B가 다음 조회에서야 나타나도 반영되어야 함
+    changed = index.merge(
+        [{"carNo": "A", "inDatetime": same}, {"carNo": "B", "inDatetime": same}],
+        NOW.timestamp(),
+    )
+    assert changed == {"B"}
+    assert not index.status("B").is_exit
+
+def test_late_report_is_inserted_in_time_order() -> None:
+    index = _index()
+    latest = NOW - timedelta(hours=1)
+    index.merge([{"carNo": "A", "inDatetime": _raw(latest)}], NOW.timestamp())
+    earlier_in = NOW - timedelta(hours=5)
+    earlier_out = NOW - timedelta(hours=4)
+    index.merge(
+        [{"carNo": "A", "inDatetime": _raw(earlier_in), "outDatetime": _raw(earlier_out)}],
+        NOW.timestamp(),
+    )
+    car = index.cars["A"]
+    assert list(car.flags) == [FLAG_IN, FLAG_OUT, FLAG_IN]
+    assert list(car.times) == sorted(car.times)
+    assert not index.status("A").is_exit
+
+def test_reports_before_overlap_window_are_skipped() -> None:
+    index = _index()
+    index.merge([{"carNo": "A", "inDatetime": _raw(NOW)}], NOW.timestamp())
+    old = NOW - timedelta(seconds=index.overlap + 60)
+    assert index.merge([{"carNo": "B", "inDatetime": _raw(old)}], NOW.timestamp()) == set()
+
+def test_prune_keeps_parked_car() -> None:
+    index = _index()
+    entered = NOW - timedelta(days=40)
+    index.merge([{"carNo": "A", "inDatetime": _raw(entered)}], NOW.timestamp())
+    assert not index.cars["A"].times
+    status = index.status("A")
+    assert status is not None and not status.is_exit
+
+def test_prune_drops_car_gone_for_longer_than_retention() -> None:
+    index = _index()
+    index.merge(
+        [{
+            "carNo": "A",
+            "inDatetime": _raw(NOW - timedelta(days=41)),
+            "outDatetime": _raw(NOW - timedelta(days=40)),
+        }],
+        NOW.timestamp(),
+    )
+    assert index.status("A") is None
+
+def test_storage_round_trip() -> None:
+    index = _index()
+    index.merge(
+        [{"carNo": "A", "inDatetime": _raw(NOW - timedelta(hours=2)), "outDatetime": _raw(NOW)}],
+        NOW.timestamp(),
+    )
+    restored = _index()
+    restored.load(index.as_dict())
+    assert restored.watermark == index.watermark
+    assert restored.status("A") == index.status("A")
+    assert list(restored.cars["A"].times) == list(index.cars["A"].times)
+
+def test_loads_legacy_watermark() -> None:
+    index = _index()
+    index.load({"watermark": [123.0, "2025-01-01 00:00:00"], "cars": {}})
+    assert index.watermark == 123.0
@@ -0,0 +1,73 @@
+"""Tests for the billing-cycle fee cache."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.aptner.api import AptnerClient
+from custom_components.aptner.const import FEE_NEGATIVE_TTL, SOURCE_FEE
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+from custom_components.aptner.fee_cache import FeeCache
+from custom_components.aptner.models import Fee
+
+def _ts(month: int, day: int) -> float:
+    return datetime(2025, month, day, 12, tzinfo=timezone.utc).timestamp()
+
+def _fee(month: int) -> Fee:
+    return Fee(year=2025, month=month, amount=100_000)
+
+@pytest.mark.asyncio
+async def test_bill_is_cached_until_the_next_posting_window(hass: HomeAssistant) -> None:
+    cache = FeeCache(hass, "user")
+    assert not cache.is_fresh(_ts(1, 10))
+    cache.set_fee(_fee(1), _ts(1, 10))
+    assert cache.is_fresh(_ts(1, 31))
+    # 고지일을 아직 모르면 다음 달 1일부터 조회
+    assert not cache.is_fresh(_ts(2, 1))
+
+    # 같은 고지서면 주기 유지, 새 고지서가 나온 날을 기억
+    cache.set_fee(_fee(1), _ts(2, 1))
+    cache.set_fee(_fee(2), _ts(2, 12))
+    assert cache.posted_day == 12
+    assert cache.is_fresh(_ts(3, 8))
+    assert not cache.is_fresh(_ts(3, 9))
+
+@pytest.mark.asyncio
+async def test_missing_fee_is_cached_for_the_negative_ttl(hass: HomeAssistant) -> None:
+    cache = FeeCache(hass, "user")
+    cache.set_missing(_ts(1, 10))
+    ttl = FEE_NEGATIVE_TTL.total_seconds()
+    assert cache.is_fresh(_ts(1, 10) + ttl - 1)
+    assert not cache.is_fresh(_ts(1, 10) + ttl)
+
+@pytest.mark.asyncio
+async def test_restore_and_expire(hass: HomeAssistant) -> None:
+    cache = FeeCache(hass, "user")
+    cache.set_fee(_fee(1), _ts(1, 10))
+    cache.set_fee(_fee(2), _ts(2, 5))
+    await cache._store.async_save(cache._data_to_save())
+    restored = FeeCache(hass, "user")
+    await restored.async_load()
+    assert restored.as_dict() == cache.as_dict()
+
+    restored.expire()
+    assert not restored.is_fresh(_ts(2, 6))
+    restored.set_fee(_fee(2), _ts(2, 6))
+    assert restored.is_fresh(_ts(2, 7))
+
+@pytest.mark.asyncio
+async def test_max_age_bypasses_the_fee_cache(
+    coordinator: AptnerDataCoordinator, client: AptnerClient, server
+) -> None:
+    await coordinator.async_refresh()
+    assert client.fee_cache.is_fresh(datetime.now().timestamp())
+    server.reset_counters()
+
+    await coordinator.async_get_source(SOURCE_FEE, 3600)
+    assert server.requests["/fee/detail"] == 0
+
+    coordinator.fetched_at[SOURCE_FEE] -= 120
+    await coordinator.async_get_source(SOURCE_FEE, 60)
+    assert server.requests["/fee/detail"] == 1
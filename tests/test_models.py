@@ -0,0 +1,58 @@
+"""Tests for the typed API payload models."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from custom_components.aptner.models import (
+    AccessEvent,
+    CarStatus,
+    Fee,
+    ReserveRange,
+    parse_aptner_datetime,
+    reserve_ranges_as_dict,
+    reserve_ranges_from_dict,
+)
+
+TZ = timezone(timedelta(hours=9))
+
+def test_parse_aptner_datetime_formats() -> None:
+    expected = datetime(2025, 1, 2, 3, 4, 5, tzinfo=TZ).timestamp()
+    for value in ("2025-01-02 03:04:05", "2025.01.02 03:04:05", "2025-01-02T03:04:05"):
+        assert parse_aptner_datetime(value, TZ) == expected
+    assert parse_aptner_datetime("2025.01.02 03:04", TZ) == expected - 5
+    assert parse_aptner_datetime("2025-01-02T03:04:05+00:00", TZ) == expected + 9 * 3600
+    assert parse_aptner_datetime("not a date", TZ) is None
+    assert parse_aptner_datetime(None, TZ) is None
+
+def test_fee_round_trip() -> None:
+    fee = Fee.from_api(
+        {"year": 2025, "month": 3, "currentFee": 1000, "details": [{"name": "전기료", "value": 400}]}
+    )
+    assert fee == Fee(2025, 3, 1000, {"전기료": 400})
+    assert Fee.from_dict(fee.as_dict()) == fee
+
+def test_car_status_round_trip() -> None:
+    entered = datetime(2025, 1, 2, 8, 0, tzinfo=TZ)
+    left = datetime(2025, 1, 2, 9, 30, tzinfo=TZ)
+    status = CarStatus.from_times("12가3456", entered.timestamp(), left.timestamp(), TZ)
+    assert status.is_exit and status.status == "out"
+    assert CarStatus.from_dict(status.as_dict(), TZ) == status
+
+    parked = CarStatus.from_times("12가3456", left.timestamp(), entered.timestamp(), TZ)
+    assert not parked.is_exit and parked.out_datetime is None
+    missing = CarStatus.not_found("34나5678")
+    assert CarStatus.from_dict(missing.as_dict(), TZ) == missing
+    assert missing.status == "not_found"
+
+def test_reserve_ranges_round_trip() -> None:
+    item = ReserveRange(date(2025, 1, 30), date(2025, 2, 1))
+    assert item.days == 3
+    assert item.dates() == {date(2025, 1, 30), date(2025, 1, 31), date(2025, 2, 1)}
+    data = {"A": [item]}
+    assert reserve_ranges_as_dict(data) == {"A": [{"from": "2025-01-30", "to": "2025-02-01"}]}
+    assert reserve_ranges_from_dict(reserve_ranges_as_dict(data)) == data
+
+def test_access_event_parse() -> None:
+    event = AccessEvent.parse("A", "2025.01.02 03:04:05", True, TZ)
+    assert event == AccessEvent("A", datetime(2025, 1, 2, 3, 4, 5, tzinfo=TZ), True, "2025.01.02 03:04:05")
+    assert AccessEvent.parse("A", "garbage", False, TZ) is None
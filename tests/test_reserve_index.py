@@ -0,0 +1,86 @@
+"""Tests for the incremental reservation index."""
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from custom_components.aptner.models import ReserveRange
+from custom_components.aptner.reserve_index import ReservationIndex
+
+BASE = date(2025, 1, 1)
+
+def _day(offset: int) -> date:
+    return BASE + timedelta(days=offset)
+
+def test_reservation_index_merges_adjacent_ranges() -> None:
+    index = ReservationIndex()
+    index.add("A", _day(0), _day(1))
+    index.add("A", _day(2), _day(3))
+    index.add("A", _day(6), _day(6))
+    assert index.car_ranges("A", BASE) == [
+        ReserveRange(_day(0), _day(3)),
+        ReserveRange(_day(6), _day(6)),
+    ]
+    assert index.range_on("A", _day(2)) == ReserveRange(_day(0), _day(3))
+    assert index.range_on("A", _day(4)) is None
+    assert index.cars_on(_day(1)) == {"A"}
+    assert index.cars_on(_day(5)) == frozenset()
+
+def test_reservation_index_matches_brute_force() -> None:
+    rng = random.Random(2)
+    for _ in range(100):
+        index = ReservationIndex()
+        truth: dict[str, set[date]] = {}
+        floor = BASE
+        for _ in range(30):
+            car = rng.choice("ABC")
+            action = rng.random()
+            if action < 0.5:
+                start = _day(rng.randint(0, 30))
+                end = start + timedelta(days=rng.randint(0, 4))
+                index.add(car, start, end)
+                truth.setdefault(car, set()).update(ReserveRange(start, end).dates())
+            elif action < 0.85:
+                dates = {_day(rng.randint(0, 30)) for _ in range(rng.randint(0, 6))}
+                index.set_car(car, dates)
+                truth[car] = dates
+            else:
+                cutoff = _day(rng.randint(0, 20))
+                index.prune(cutoff)
+                floor = max(floor, cutoff)
+            for offset in range(40):
+                day = _day(offset)
+                if day < floor:
+                    continue
+                assert index.cars_on(day) == {c for c, d in truth.items() if day in d}
+                for c in "ABC":
+                    assert (index.range_on(c, day) is not None) == (day in truth.get(c, ()))
+
+def test_ranges_clip_to_since() -> None:
+    index = ReservationIndex()
+    index.add("A", _day(0), _day(5))
+    index.add("B", _day(0), _day(1))
+    assert index.ranges(_day(3)) == {"A": [ReserveRange(_day(3), _day(5))]}
+
+def test_range_queries_match_brute_force() -> None:
+    rng = random.Random(1)
+    index = ReservationIndex()
+    truth: dict[str, list[ReserveRange]] = {}
+    for car in ("A", "B", "C", "D"):
+        dates = {_day(rng.randint(0, 60)) for _ in range(rng.randint(0, 20))}
+        index.set_car(car, dates)
+        truth[car] = index.car_ranges(car, date.min)
+    for _ in range(200):
+        lo = rng.randint(-5, 70)
+        hi = lo + rng.randint(0, 10)
+        expected = sorted(
+            ((car, item) for car, items in truth.items() for item in items
+             if item.start <= _day(hi) and item.end >= _day(lo)),
+            key=lambda found: (found[1].start, found[0]),
+        )
+        assert index.overlapping(_day(lo), _day(hi)) == expected
+        following = sorted(
+            ((car, item) for car, items in truth.items() for item in items if item.end >= _day(lo)),
+            key=lambda found: (found[1].start, found[0]),
+        )
+        assert index.next_from(_day(lo)) == (following[0] if following else None)
@@ -0,0 +1,96 @@
+"""Tests for reserve page parsing and the concurrent page walk."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from custom_components.aptner.api import AptnerClient, compress_ranges, parse_reserve_page
+from custom_components.aptner.models import ReserveRange
+
+TODAY = date.today()
+
+def _row(carno: str, offset: int, days: int = 1) -> dict:
+    return {
+        "carNo": carno,
+        "visitDate": (TODAY + timedelta(days=offset)).strftime("%Y.%m.%d"),
+        "days": days,
+    }
+
+def _day(offset: int) -> date:
+    return TODAY + timedelta(days=offset)
+
+def test_parse_reserve_page_keeps_upcoming_days() -> None:
+    cars, past = parse_reserve_page(
+        {"reserveList": [_row("A", 2, days=2), _row("B", -3, days=4), _row("C", -5)]}, TODAY
+    )
+    assert cars == {"A": [_day(2), _day(3)], "B": [_day(0)]}
+    assert not past
+
+def test_parse_reserve_page_reports_all_past() -> None:
+    assert parse_reserve_page({"reserveList": [_row("A", -2), _row("B", -9)]}, TODAY) == ({}, True)
+    assert parse_reserve_page({"reserveList": []}, TODAY) == ({}, False)
+
+def test_compress_ranges() -> None:
+    assert compress_ranges([_day(3), _day(0), _day(1), _day(1)]) == [
+        ReserveRange(_day(0), _day(1)),
+        ReserveRange(_day(3), _day(3)),
+    ]
+
+def _fake_pages(client: AptnerClient, pages: dict[int, dict | Exception]) -> list[int]:
+    """Serve reserve pages from a dict; return the list of requested pages."""
+    requested: list[int] = []
+
+    async def request(method: str, path: str, **kwargs) -> dict:
+        page = int(path.rsplit("=", 1)[1])
+        requested.append(page)
+        result = pages[page]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client.request = request
+    return requested
+
+def _page(*rows: dict, total: int) -> dict:
+    return {"totalPages": total, "reserveList": list(rows)}
+
+@pytest.mark.asyncio
+async def test_failed_page_yields_none_and_walk_continues(client: AptnerClient) -> None:
+    _fake_pages(
+        client,
+        {
+            1: _page(_row("A", 5), total=4),
+            2: RuntimeError("boom"),
+            3: _page(_row("B", 3), total=4),
+            4: _page(_row("C", 1), total=4),
+        },
+    )
+    pages = [(page, data is not None) async for page, data in client.async_iter_reserve_pages()]
+    assert pages == [(1, True), (2, False), (3, True), (4, True)]
+    assert await client.get_reserve_status() == {
+        "A": [ReserveRange(_day(5), _day(5))],
+        "B": [ReserveRange(_day(3), _day(3))],
+        "C": [ReserveRange(_day(1), _day(1))],
+    }
+
+@pytest.mark.asyncio
+async def test_walk_stops_after_a_page_of_past_reservations(client: AptnerClient) -> None:
+    client._page_concurrency = 1
+    requested = _fake_pages(
+        client,
+        {
+            1: _page(_row("A", 1), total=5),
+            2: _page(_row("B", -1), _row("C", -2), total=5),
+            3: _page(_row("D", -3), total=5),
+        },
+    )
+    assert await client.get_reserve_status() == {"A": [ReserveRange(_day(1), _day(1))]}
+    assert requested == [1, 2]
+
+@pytest.mark.asyncio
+async def test_mock_server_pages(client: AptnerClient) -> None:
+    await client.authenticate()
+    ranges = await client.get_reserve_status()
+    assert ranges
+    assert all(item.end >= TODAY for items in ranges.values() for item in items)
@@ -0,0 +1,129 @@
+"""Tests for the incremental reserve sync."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import AsyncIterator
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.aptner.api import AptnerError
+from custom_components.aptner.models import ReserveRange
+from custom_components.aptner.reserve_sync import (
+    AptnerReserveSync,
+    covered_dates,
+    parse_visit_date,
+    reservation_dates,
+)
+
+TODAY = date.today()
+
+def _day(offset: int) -> date:
+    return TODAY + timedelta(days=offset)
+
+def _row(carno: str, offset: int, days: int = 1) -> dict:
+    return {"carNo": carno, "visitDate": _day(offset).strftime("%Y.%m.%d"), "days": days}
+
+class FakeClient:
+    """Serves a fixed list of reserve pages (None = failed page, exception = raised)."""
+
+    def __init__(self, *pages: list[dict] | Exception | None) -> None:
+        self.pages = list(pages)
+
+    async def async_iter_reserve_pages(self) -> AsyncIterator[tuple[int, dict | None]]:
+        for page, rows in enumerate(self.pages, 1):
+            if isinstance(rows, Exception):
+                raise rows
+            yield page, None if rows is None else {"reserveList": rows}
+
+def test_helpers() -> None:
+    assert parse_visit_date("2025.03.01") == parse_visit_date("2025-03-01") == date(2025, 3, 1)
+    with pytest.raises(ValueError):
+        parse_visit_date("03/01/2025")
+    assert reservation_dates(_day(0), 2) == {_day(0), _day(1)}
+    assert reservation_dates(_day(0), 0) == {_day(0)}
+    assert covered_dates({"A": [ReserveRange(_day(0), _day(1))]}) == {"A": {_day(0), _day(1)}}
+
+@pytest.mark.asyncio
+async def test_unchanged_pages_are_skipped(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1), _row("B", 2, days=2)], [_row("C", 0)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    assert await sync.async_sync() == {
+        "A": [ReserveRange(_day(1), _day(1))],
+        "B": [ReserveRange(_day(2), _day(3))],
+        "C": [ReserveRange(_day(0), _day(0))],
+    }
+    assert (sync.pages_parsed, sync.pages_skipped) == (2, 0)
+
+    client.pages[1] = [_row("C", 4)]
+    ranges = await sync.async_sync()
+    assert (sync.pages_parsed, sync.pages_skipped) == (3, 1)
+    assert ranges["C"] == [ReserveRange(_day(4), _day(4))]
+    assert sync.index.cars_on(_day(0)) == frozenset()
+
+@pytest.mark.asyncio
+async def test_failed_page_keeps_previous_result(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1)], [_row("B", 2)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    await sync.async_sync()
+    client.pages[1] = None
+    assert set(await sync.async_sync()) == {"A", "B"}
+
+@pytest.mark.asyncio
+async def test_vanished_page_is_dropped(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1)], [_row("B", 2)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    await sync.async_sync()
+    client.pages.pop()
+    assert set(await sync.async_sync()) == {"A"}
+    assert "B" not in sync.dates
+
+@pytest.mark.asyncio
+async def test_paging_stops_at_a_page_that_ended(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1)], [_row("B", -2)], [_row("C", -5)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    await sync.async_sync()
+    assert sync.pages_parsed == 2
+
+@pytest.mark.asyncio
+async def test_restore_from_storage(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1, days=3)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    await sync.async_sync()
+    await sync._store.async_save(sync._data_to_save())
+
+    restored = AptnerReserveSync(hass, client, "entry")
+    await restored.async_load()
+    assert restored.index.range_on("A", _day(2)) == ReserveRange(_day(1), _day(3))
+    await restored.async_sync()
+    assert (restored.pages_parsed, restored.pages_skipped) == (0, 1)
+
+@pytest.mark.asyncio
+async def test_past_days_are_pruned(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", -1, days=3)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    sync.index.add("B", _day(-10), _day(-5))
+    assert await sync.async_sync() == {"A": [ReserveRange(_day(0), _day(1))]}
+    assert sync.index.range_on("B", _day(-6)) is None
+    assert len(sync.index) == 1
+
+@pytest.mark.asyncio
+async def test_write_through_stays_pending_when_sync_fails(hass: HomeAssistant) -> None:
+    client = FakeClient([_row("A", 1)], [_row("B", 2)])
+    sync = AptnerReserveSync(hass, client, "entry")
+    await sync.async_sync()
+
+    sync.apply_reservation("W", _day(3), 2)
+    client.pages = [[_row("A", 1), _row("B", 5)], AptnerError("timeout")]
+    with pytest.raises(AptnerError):
+        await sync.async_sync()
+    # 실패 전까지 바뀐 페이지의 차량과 쓰기 반영 차량은 다음 동기화에서 다시 병합
+    assert sync._pending == {"A", "B", "W"}
+    assert sync.index.range_on("W", _day(4)) == ReserveRange(_day(3), _day(4))
+
+    # API에 나타나지 않은 예약은 다음 동기화에서 정리
+    client.pages = [[_row("A", 1), _row("B", 5)], [_row("B", 2)]]
+    ranges = await sync.async_sync()
+    assert sync._pending == set()
+    assert "W" not in ranges
+    assert ranges["B"] == [ReserveRange(_day(2), _day(2)), ReserveRange(_day(5), _day(5))]
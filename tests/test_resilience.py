@@ -0,0 +1,123 @@
+"""Tests for the retry classification and circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ClientConnectorError, ClientResponseError, RequestInfo, ServerDisconnectedError
+from aiohttp.client_reqrep import ConnectionKey
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from custom_components.aptner.api import AptnerClient, AptnerNotFoundError
+from custom_components.aptner.resilience import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+    is_ambiguous,
+    is_transient,
+    retry_after,
+)
+
+def _http_error(status: int, headers: dict | None = None) -> ClientResponseError:
+    url = URL("http://aptner.test/")
+    info = RequestInfo(url, "GET", CIMultiDictProxy(CIMultiDict()), url)
+    return ClientResponseError(info, (), status=status, headers=headers)
+
+def _connect_error() -> ClientConnectorError:
+    key = ConnectionKey("aptner.test", 443, True, True, None, None, None)
+    return ClientConnectorError(key, OSError("refused"))
+
+@pytest.mark.parametrize(
+    ("error", "transient", "ambiguous"),
+    [
+        (_http_error(500), True, True),
+        (_http_error(503), True, True),
+        (_http_error(429), True, False),
+        (_http_error(404), False, False),
+        (_http_error(401), False, False),
+        (asyncio.TimeoutError(), True, True),
+        (ServerDisconnectedError(), True, True),
+        (_connect_error(), True, False),
+        (ValueError(), False, False),
+    ],
+)
+def test_error_classification(error: BaseException, transient: bool, ambiguous: bool) -> None:
+    assert is_transient(error) is transient
+    assert is_ambiguous(error) is ambiguous
+
+def test_retry_after_header() -> None:
+    assert retry_after(_http_error(429, {"Retry-After": "3"})) == 3.0
+    assert retry_after(_http_error(429)) is None
+    assert retry_after(_http_error(503, {"Retry-After": "soon"})) is None
+
+def test_backoff_is_bounded() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    for retry in range(10):
+        assert 0 <= policy.backoff(retry) <= 4.0
+
+def test_breaker_opens_and_recovers() -> None:
+    clock = [1000.0]
+    with patch("custom_components.aptner.resilience.time.monotonic", lambda: clock[0]):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN and not breaker.allow()
+        assert breaker.retry_in() == 60
+
+        clock[0] += 60
+        assert breaker.state == STATE_HALF_OPEN
+        # 반개방 상태에서는 probe 하나만 허용
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        clock[0] += 60
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED and breaker.failures == 0
+
+def _counting(error: BaseException):
+    calls = []
+
+    async def attempt() -> None:
+        calls.append(1)
+        raise error
+
+    return attempt, calls
+
+@pytest.mark.asyncio
+async def test_idempotent_calls_retry_transient_errors(client: AptnerClient) -> None:
+    client._retry_policy = RetryPolicy(base_delay=0, max_delay=0)
+    attempt, calls = _counting(ServerDisconnectedError())
+    with pytest.raises(ServerDisconnectedError):
+        await client._call("/fee/detail", attempt)
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_non_idempotent_calls_are_not_retried_when_ambiguous(client: AptnerClient) -> None:
+    client._retry_policy = RetryPolicy(base_delay=0, max_delay=0)
+    attempt, calls = _counting(_http_error(503))
+    with pytest.raises(ClientResponseError):
+        await client._call("/pc/reserve/", attempt, idempotent=False)
+    assert len(calls) == 1
+    assert client.breaker("/pc/reserve/").failures == 1
+
+    # 연결 자체가 안 됐으면 처리되지 않았으므로 재시도
+    attempt, calls = _counting(_connect_error())
+    with pytest.raises(ClientConnectorError):
+        await client._call("/pc/reserve/", attempt, idempotent=False)
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_not_found_is_permanent(client: AptnerClient) -> None:
+    attempt, calls = _counting(_http_error(404))
+    with pytest.raises(AptnerNotFoundError):
+        await client._call("/fee/detail", attempt)
+    assert len(calls) == 1
+    assert client.breaker("/fee/detail").state == STATE_CLOSED
@@ -0,0 +1,45 @@
+"""Tests for the adaptive car status poll scheduler."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.aptner.scheduler import AdaptivePollScheduler, parse_active_hours
+
+BASE = timedelta(minutes=5)
+NOON = datetime(2025, 1, 1, 12, 0)
+
+def test_parse_active_hours() -> None:
+    assert parse_active_hours("7-9, 18-22") == [(7, 9), (18, 22)]
+    assert parse_active_hours("22-2") == [(22, 2)]
+    assert parse_active_hours("") == []
+
+@pytest.mark.parametrize("value", ["7", "7-7", "25-3", "a-b"])
+def test_parse_active_hours_rejects_bad_input(value: str) -> None:
+    with pytest.raises(ValueError):
+        parse_active_hours(value)
+
+def test_fast_after_a_change_then_base_then_backoff() -> None:
+    scheduler = AdaptivePollScheduler(BASE)
+    scheduler.record(True, 0)
+    assert scheduler.next_interval(60, NOON) == scheduler.fast_interval
+    assert scheduler.next_interval(3600, NOON) == BASE
+    backed_off = scheduler.next_interval(3600 * 4, NOON)
+    assert BASE < backed_off <= scheduler.max_interval
+    assert scheduler.next_interval(3600 * 100, NOON) == scheduler.max_interval
+
+def test_active_hours_poll_fast() -> None:
+    scheduler = AdaptivePollScheduler(BASE, active_hours=[(22, 2)])
+    scheduler.record(False, 0)
+    late = 3600 * 10
+    assert scheduler.next_interval(late, NOON.replace(hour=23)) == scheduler.fast_interval
+    assert scheduler.next_interval(late, NOON.replace(hour=1)) == scheduler.fast_interval
+    assert scheduler.next_interval(late, NOON) > scheduler.fast_interval
+
+def test_request_budget_slows_polling() -> None:
+    scheduler = AdaptivePollScheduler(BASE)
+    scheduler.record(True, 0)
+    interval = scheduler.next_interval(10, NOON, budget_wait=900)
+    assert interval == timedelta(seconds=900)
+    assert scheduler.target_interval == scheduler.fast_interval
@@ -0,0 +1,115 @@
+"""Tests for the account fan-out and the reserve_cars service."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from homeassistant.core import ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.aptner.api import AptnerError
+from custom_components.aptner.const import DOMAIN, SOURCE_RESERVE
+from custom_components.aptner.coordinator import AptnerDataCoordinator
+from custom_components.aptner.services import (
+    SERVICE_RESERVE_CARS,
+    _query_service,
+    async_setup_services,
+)
+
+@pytest_asyncio.fixture
+async def reserved(hass, coordinator: AptnerDataCoordinator, monkeypatch) -> list[dict[str, Any]]:
+    """Register the services and record the reservations posted."""
+    await coordinator.async_refresh()
+    hass.data[DOMAIN] = {coordinator._entry.entry_id: {"coordinator": coordinator}}
+    async_setup_services(hass)
+    posted: list[dict[str, Any]] = []
+
+    async def reserve_car(**kwargs: Any) -> None:
+        posted.append(kwargs)
+        if kwargs["carno"].startswith("실패"):
+            raise AptnerError("rejected")
+
+    monkeypatch.setattr(coordinator.client, "reserve_car", reserve_car)
+    return posted
+
+async def _reserve_cars(hass, reservations: list[dict[str, Any]]) -> dict[str, Any]:
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_RESERVE_CARS,
+        {"reservations": reservations, "phone": "010-0000-0000"},
+        blocking=True,
+        return_response=True,
+    )
+
+@pytest.mark.asyncio
+async def test_duplicates_and_covered_dates_are_skipped(
+    hass, coordinator: AptnerDataCoordinator, reserved: list[dict[str, Any]]
+) -> None:
+    carno, ranges = next(iter(coordinator.data[SOURCE_RESERVE].items()))
+    covered = ranges[0].start.strftime("%Y.%m.%d")
+    day = (date.today() + timedelta(days=3)).strftime("%Y.%m.%d")
+    response = await _reserve_cars(
+        hass,
+        [
+            {"carno": "99가9999", "date": day, "days": 1},
+            {"carno": "99가9999", "date": day.replace(".", "-"), "days": 1},
+            {"carno": "99가9999", "date": day, "days": 2},
+            {"carno": carno, "date": covered, "days": 1},
+            {"carno": "99가9999", "date": "내일", "days": 1},
+        ],
+    )
+    assert [r["status"] for r in response["results"]] == [
+        "reserved", "skipped", "reserved", "skipped", "failed",
+    ]
+    assert (response["reserved"], response["skipped"], response["failed"]) == (2, 2, 1)
+    assert len(reserved) == 2
+
+@pytest.mark.asyncio
+async def test_duplicate_of_failed_entry_fails(hass, reserved: list[dict[str, Any]]) -> None:
+    day = (date.today() + timedelta(days=3)).strftime("%Y.%m.%d")
+    response = await _reserve_cars(
+        hass,
+        [
+            {"carno": "실패12가3456", "date": day, "days": 2},
+            {"carno": "실패12가3456", "date": day, "days": 1},
+        ],
+    )
+    assert [r["status"] for r in response["results"]] == ["failed", "failed"]
+    assert "duplicate of a failed entry" in response["results"][1]["error"]
+    assert len(reserved) == 1
+
+def _call(data: dict[str, Any]) -> ServiceCall:
+    return ServiceCall(DOMAIN, "test", data)
+
+@pytest.mark.asyncio
+async def test_query_without_entry_id_is_keyed_by_entry(hass) -> None:
+    hass.data[DOMAIN] = {"one": {"coordinator": "c1"}, "two": {"coordinator": "c2"}}
+
+    async def handler(call: ServiceCall, coordinator: Any) -> Any:
+        if coordinator == "c2":
+            raise AptnerError("down")
+        return coordinator
+
+    service = _query_service(hass, "test", handler)
+    assert await service(_call({})) == {"one": "c1", "two": {"error": "down"}}
+    assert await service(_call({"entry_id": "one"})) == "c1"
+    with pytest.raises(HomeAssistantError, match="down"):
+        await service(_call({"entry_id": "two"}))
+    with pytest.raises(HomeAssistantError, match="Unknown"):
+        await service(_call({"entry_id": "three"}))
+
+    # 한 계정만 있어도 entry_id를 생략하면 엔트리별로 응답
+    del hass.data[DOMAIN]["two"]
+    assert await service(_call({})) == {"one": "c1"}
+
+@pytest.mark.asyncio
+async def test_query_fails_when_every_account_fails(hass) -> None:
+    hass.data[DOMAIN] = {"one": {"coordinator": "c1"}, "two": {"coordinator": "c2"}}
+
+    async def handler(call: ServiceCall, coordinator: Any) -> Any:
+        raise AptnerError(f"{coordinator} down")
+
+    with pytest.raises(HomeAssistantError, match="one: c1 down; two: c2 down"):
+        await _query_service(hass, "test", handler)(_call({}))
@@ -0,0 +1,102 @@
+"""Tests for the incremental JSON array streamer."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.aptner import api
+from custom_components.aptner.api import AptnerClient
+from custom_components.aptner.const import ACCESS_HISTORY_PATH, ACCESS_REPORT_KEY
+from custom_components.aptner.streaming import JsonArrayStreamer, iter_json_arrays
+
+KEY = "visitCarUseHistoryReportList"
+
+def _document(reports: list[dict]) -> bytes:
+    return json.dumps(
+        {"month": "2025-01", KEY: reports, "other": [{"x": 1}]}, ensure_ascii=False
+    ).encode("utf-8")
+
+def _stream(data: bytes, chunk_size: int) -> list:
+    parser = JsonArrayStreamer(KEY)
+    items = []
+    for idx in range(0, len(data), chunk_size):
+        items.extend(parser.feed(data[idx:idx + chunk_size]))
+    return items
+
+REPORTS = [
+    {"carNo": "12가3456", "inDatetime": "2025-01-01 10:00:00", "outDatetime": None},
+    {"carNo": "34나5678", "note": 'quote " and brace } inside', "tags": ["a", {"b": [1]}]},
+    {"carNo": "56다7890", "inDatetime": "2025-01-02 08:30:00", "nested": {"deep": {"v": 1}}},
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_yields_every_element_regardless_of_chunking(chunk_size: int) -> None:
+    assert _stream(_document(REPORTS), chunk_size) == REPORTS
+
+def test_arrays_under_other_keys_are_ignored() -> None:
+    data = json.dumps({"other": [{"carNo": "x"}], KEY: [{"carNo": "y"}]}).encode()
+    assert _stream(data, 3) == [{"carNo": "y"}]
+
+def test_every_array_under_key_is_streamed() -> None:
+    # 월별 목록마다 같은 키가 반복됨
+    data = json.dumps(
+        {"months": [{KEY: [{"carNo": "a"}]}, {KEY: []}, {KEY: [{"carNo": "b"}]}]}
+    ).encode()
+    assert _stream(data, 5) == [{"carNo": "a"}, {"carNo": "b"}]
+
+def test_null_value_under_key() -> None:
+    data = json.dumps({KEY: None, "other": [{"carNo": "x"}]}).encode()
+    assert _stream(data, 4) == []
+
+def test_key_inside_string_value_is_not_matched() -> None:
+    data = json.dumps({"note": KEY, KEY: [{"carNo": "z"}]}).encode()
+    assert _stream(data, 6) == [{"carNo": "z"}]
+
+def test_buffer_only_holds_the_element_in_progress() -> None:
+    reports = [{"carNo": f"{i:04d}", "inDatetime": "2025-01-01 10:00:00"} for i in range(2000)]
+    data = _document(reports)
+    parser = JsonArrayStreamer(KEY)
+    largest = 0
+    count = 0
+    for idx in range(0, len(data), 512):
+        count += len(list(parser.feed(data[idx:idx + 512])))
+        largest = max(largest, len(parser._buf))
+    assert count == len(reports)
+    assert largest < 1024
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"month": "2025-01", KEY: REPORTS, "other": [{"x": 1}]},
+        {"months": [{KEY: [{"carNo": "a"}, 3]}, {KEY: None}, {KEY: [{"carNo": "b"}]}]},
+        {"note": KEY, KEY: [[1, 2], {"carNo": "z"}]},
+    ],
+)
+def test_whole_document_parser_matches_streamer(document: dict) -> None:
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_arrays(json.loads(data), KEY)) == _stream(data, 5)
+
+@pytest.mark.asyncio
+async def test_only_large_responses_are_streamed(
+    client: AptnerClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await client.authenticate()
+    streamers = []
+
+    class SpyStreamer(JsonArrayStreamer):
+        def __init__(self, *args) -> None:
+            super().__init__(*args)
+            streamers.append(self)
+
+    monkeypatch.setattr(api, "JsonArrayStreamer", SpyStreamer)
+
+    async def reports() -> list:
+        return [item async for item in client._raw_stream(ACCESS_HISTORY_PATH, ACCESS_REPORT_KEY)]
+
+    whole = await reports()
+    assert whole and not streamers
+
+    monkeypatch.setattr(api, "STREAM_MIN_SIZE", 1024)
+    assert await reports() == whole
+    assert len(streamers) == 1
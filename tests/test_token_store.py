@@ -0,0 +1,58 @@
+"""Tests for the persisted access token and its refresh margin."""
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from benchmarks.mock_server import MockAptnerServer, make_token
+from custom_components.aptner.api import AptnerClient
+from custom_components.aptner.token_store import AptnerTokenStore, token_expiry
+
+def test_token_expiry() -> None:
+    token = make_token(600)
+    assert token_expiry(token) == pytest.approx(token_expiry(make_token(0)) + 600, abs=2)
+    assert token_expiry("opaque-token") is None
+
+@pytest.mark.asyncio
+async def test_saved_token_is_read_by_another_store(hass: HomeAssistant) -> None:
+    token = make_token(3600)
+    await AptnerTokenStore(hass, "user").async_save(token)
+    assert await AptnerTokenStore(hass, "user").async_load() == token
+    assert await AptnerTokenStore(hass, "other").async_load() is None
+
+@pytest.mark.asyncio
+async def test_expired_and_legacy_tokens_are_ignored(hass: HomeAssistant) -> None:
+    store = AptnerTokenStore(hass, "user")
+    await store.async_save(make_token(-10))
+    assert await store.async_load() is None
+    # 이전 버전의 암호화된 토큰
+    await store._store.async_save({"token": "gAAAAABencrypted"})
+    assert await store.async_load() is None
+    await store.async_remove()
+    assert await store.async_load() is None
+
+@pytest.mark.asyncio
+async def test_config_flow_token_handoff(hass: HomeAssistant, server: MockAptnerServer) -> None:
+    flow_client = AptnerClient(hass, "user", "secret", base_url=server.base_url)
+    await flow_client.authenticate()
+    await flow_client.async_save_token()
+    await flow_client.async_close()
+
+    entry_client = AptnerClient(hass, "user", "secret", base_url=server.base_url)
+    await entry_client.async_load()
+    assert entry_client.token == flow_client.token
+    server.reset_counters()
+    await entry_client.get_fee()
+    assert server.requests["/auth/token"] == 0
+    await entry_client.async_close()
+
+@pytest.mark.asyncio
+async def test_refresh_margin_is_bounded_for_short_lived_tokens(client: AptnerClient) -> None:
+    client._set_token(make_token(3600), persist=False)
+    assert client._token_margin == 300
+    client._set_token(make_token(100), persist=False)
+    assert client._token_margin == pytest.approx(25, abs=1)
+    assert not client._token_expiring()
+    # 이미 만료된 것으로 보이는 토큰은 만료시간 없이 사용
+    client._set_token(make_token(-5), persist=False)
+    assert client._token_expires is None and not client._token_expiring()